@@ -1,11 +1,29 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, Request, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, send_file, g
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import validates
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.exc import OperationalError
+from werkzeug.utils import secure_filename
 from datetime import datetime
+from sqlalchemy import bindparam
 from flask_wtf.csrf import CSRFProtect, generate_csrf
 import os
-import sqlite3
 import logging
 import traceback
+import threading
+import secrets
+import backup
+import attachments
+import rates
+import read_model
+import query_lang
+import fragments
+import contacts
+from contacts import link_contacts
+from db_executor import BoundedExecutor
+from epoch_days import to_epoch_day
+from sharding import RoutingSession, ShardRouter, UnknownTenant, normalize_tenant, tenant_from_request
 
 # Configure logging
 logging.basicConfig(
@@ -16,13 +34,59 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///resume_tracker.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///resume_tracker.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['WTF_CSRF_TIME_LIMIT'] = None
 
+# Multi-tenant mode: each user gets their own SQLite shard file
+app.config['MULTI_TENANT'] = os.environ.get('RESUME_TRACKER_MULTI_TENANT', '').lower() in ('1', 'true', 'yes')
+app.config['SHARD_DIR'] = os.environ.get('RESUME_TRACKER_SHARD_DIR', os.path.join(app.instance_path, 'shards'))
+app.config['SHARD_MAX_ENGINES'] = int(os.environ.get('RESUME_TRACKER_SHARD_MAX_ENGINES', '32'))
+# Comma-separated allow-list; requests naming any other tenant are refused
+app.config['TENANTS'] = [t.strip() for t in os.environ.get('RESUME_TRACKER_TENANTS', '').split(',') if t.strip()]
+app.config['BACKUP_DIR'] = os.environ.get('RESUME_TRACKER_BACKUP_DIR', os.path.join(app.instance_path, 'backups'))
+app.config['BACKUP_KEEP'] = int(os.environ.get('RESUME_TRACKER_BACKUP_KEEP', str(backup.DEFAULT_KEEP)))
+
+# ASGI mode (asgi.py): GET / and /search wait on the event loop and run on a
+# bounded pool of DB threads, answering 503 once its queue is full
+app.config['DB_EXECUTOR_WORKERS'] = int(os.environ.get('RESUME_TRACKER_DB_WORKERS', '4'))
+app.config['DB_EXECUTOR_QUEUE'] = int(os.environ.get('RESUME_TRACKER_DB_QUEUE', '64'))
+
+# Read model: serve /search, date filters and /stats from an in-memory
+# columnar copy of resume_submission (needs numpy; single-tenant only)
+app.config['READ_MODEL'] = os.environ.get('RESUME_TRACKER_READ_MODEL', '').lower() in ('1', 'true', 'yes')
+
+# Search filter language: LRU sizes for parsed queries and per-shape statements
+app.config['QUERY_CACHE_SIZE'] = int(os.environ.get('RESUME_TRACKER_QUERY_CACHE_SIZE', '512'))
+app.config['STATEMENT_CACHE_SIZE'] = int(os.environ.get('RESUME_TRACKER_STATEMENT_CACHE_SIZE', '128'))
+
+# Rendered table rows cached per (id, row_version)
+app.config['ROW_CACHE_SIZE'] = int(os.environ.get('RESUME_TRACKER_ROW_CACHE_SIZE', '20000'))
+
+# Resume attachments: content-addressed files under ATTACHMENT_DIR
+app.config['ATTACHMENT_DIR'] = os.environ.get('RESUME_TRACKER_ATTACHMENT_DIR', os.path.join(app.instance_path, 'attachments'))
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('RESUME_TRACKER_MAX_UPLOAD_MB', '50')) * 1024 * 1024
+# Let a fronting nginx/Apache send attachment files itself
+app.config['USE_X_SENDFILE'] = os.environ.get('RESUME_TRACKER_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+
 # Initialize extensions
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 csrf = CSRFProtect(app)
+db_executor = BoundedExecutor(app.config['DB_EXECUTOR_WORKERS'], app.config['DB_EXECUTOR_QUEUE'])
+query_cache = query_lang.QueryCache(app.config['QUERY_CACHE_SIZE'], app.config['STATEMENT_CACHE_SIZE'])
+
+# DATETIME column -> its integer epoch-day twin
+DAY_COLUMNS = {
+    'submission_date': 'submission_day',
+    'interview_date': 'interview_day',
+    'follow_up_date': 'follow_up_day'
+}
+
+def new_row_version():
+    # Random rather than counting: SQLite hands out a deleted row's id again,
+    # and a counter restarting at 1 would make the new row match cached fragments.
+    # 53 bits so the JSON value survives a round trip through a JavaScript number.
+    return secrets.randbits(53)
 
 class ResumeSubmission(db.Model):
     __tablename__ = 'resume_submission'
@@ -40,6 +104,38 @@ class ResumeSubmission(db.Model):
     interview_date = db.Column(db.DateTime, nullable=True)
     follow_up_date = db.Column(db.DateTime, nullable=True)
 
+    # Normalized from `rate` on every write (see rates.parse_rate)
+    rate_hourly_cents = db.Column(db.Integer, nullable=True, index=True)
+    rate_period = db.Column(db.String(10), nullable=True)
+    rate_currency = db.Column(db.String(3), nullable=True)
+
+    # Days since 1970-01-01, kept in step with the DATETIME columns for indexed range filters
+    submission_day = db.Column(db.Integer, nullable=True, index=True)
+    interview_day = db.Column(db.Integer, nullable=True, index=True)
+    follow_up_day = db.Column(db.Integer, nullable=True, index=True)
+
+    # Replaced by SQLAlchemy on every UPDATE; keys the rendered-row cache
+    row_version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': row_version, 'version_id_generator': lambda version: new_row_version()}
+
+    @validates('submission_date', 'interview_date', 'follow_up_date')
+    def _sync_epoch_day(self, key, value):
+        setattr(self, DAY_COLUMNS[key], to_epoch_day(value))
+        return value
+
+    @validates('rate')
+    def _normalize_rate(self, key, value):
+        self.rate_hourly_cents, self.rate_period, self.rate_currency = rates.parse_rate(value)
+        return value
+
+    @validates('recruiter_contact')
+    def _parse_contacts(self, key, value):
+        if value != self.recruiter_contact:
+            self.contact_points = [ContactPoint(kind=kind, value=point)
+                                   for kind, point in contacts.parse_contacts(value)]
+        return value
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -53,57 +149,300 @@ class ResumeSubmission(db.Model):
             'job_id': self.job_id,
             'notes': self.notes,
             'interview_date': self.interview_date.strftime('%Y-%m-%d') if self.interview_date else None,
-            'follow_up_date': self.follow_up_date.strftime('%Y-%m-%d') if self.follow_up_date else None
+            'follow_up_date': self.follow_up_date.strftime('%Y-%m-%d') if self.follow_up_date else None,
+            'row_version': self.row_version,
+            'contacts': [point.to_dict() for point in self.contact_points]
         }
 
+class ContactPoint(db.Model):
+    """One normalized email, E.164 phone number or URL parsed from recruiter_contact"""
+    __tablename__ = 'contact_point'
+    __table_args__ = (db.Index('ix_contact_point_kind_value', 'kind', 'value'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, db.ForeignKey('resume_submission.id'), nullable=False, index=True)
+    kind = db.Column(db.String(10), nullable=False)
+    value = db.Column(db.String(200), nullable=False)
+
+    submission = db.relationship(
+        ResumeSubmission,
+        backref=db.backref('contact_points', cascade='all, delete-orphan', lazy='selectin',
+                           order_by='ContactPoint.id')
+    )
+
+    def to_dict(self):
+        return {'kind': self.kind, 'value': self.value}
+
+class AttachmentBlob(db.Model):
+    """One stored file, shared by every attachment with the same content"""
+    __tablename__ = 'attachment_blob'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+
+class Attachment(db.Model):
+    __tablename__ = 'attachment'
+
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, db.ForeignKey('resume_submission.id'), nullable=False, index=True)
+    sha256 = db.Column(db.String(64), db.ForeignKey('attachment_blob.sha256'), nullable=False, index=True)
+    filename = db.Column(db.String(255), nullable=False)
+    content_type = db.Column(db.String(100), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    uploaded_at = db.Column(db.DateTime, nullable=False)
+
+    submission = db.relationship(
+        ResumeSubmission,
+        backref=db.backref('attachments', cascade='all, delete-orphan', lazy=True)
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'submission_id': self.submission_id,
+            'filename': self.filename,
+            'content_type': self.content_type,
+            'size': self.size,
+            'sha256': self.sha256,
+            'uploaded_at': self.uploaded_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+def backfill_rates(cursor, batch_size=1000):
+    """Parse every stored rate into the normalized rate columns, a batch at a time"""
+    last_id, updated = 0, 0
+    while True:
+        cursor.execute(
+            "SELECT id, rate FROM resume_submission WHERE id > ? AND rate IS NOT NULL ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        )
+        batch = cursor.fetchall()
+        if not batch:
+            break
+        cursor.executemany(
+            "UPDATE resume_submission SET rate_hourly_cents = ?, rate_period = ?, rate_currency = ? WHERE id = ?",
+            [(*rates.parse_rate(rate), id) for id, rate in batch]
+        )
+        last_id = batch[-1][0]
+        updated += len(batch)
+    logger.info(f"Backfilled normalized rates for {updated} rows")
+
+def backfill_contacts(cursor, batch_size=1000):
+    """Parse every stored recruiter_contact into contact_point rows, a batch at a time"""
+    last_id, inserted = 0, 0
+    while True:
+        cursor.execute(
+            "SELECT id, recruiter_contact FROM resume_submission WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        )
+        batch = cursor.fetchall()
+        if not batch:
+            break
+        points = [(id, kind, value) for id, text in batch for kind, value in contacts.parse_contacts(text)]
+        cursor.executemany("INSERT INTO contact_point (submission_id, kind, value) VALUES (?, ?, ?)", points)
+        last_id = batch[-1][0]
+        inserted += len(points)
+    logger.info(f"Backfilled {inserted} contact points")
+
+# PRAGMA user_version once contact_point has been backfilled from recruiter_contact
+CONTACTS_BACKFILLED = 1
+
+def upgrade_schema(engine):
+    """Add any columns an older resume_submission table is missing"""
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(resume_submission)")
+        columns = [col[1] for col in cursor.fetchall()]
+        logger.info(f"Current columns: {columns}")
+
+        if 'interview_date' not in columns:
+            logger.info("Adding interview_date column...")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN interview_date DATETIME")
+        if 'follow_up_date' not in columns:
+            logger.info("Adding follow_up_date column...")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN follow_up_date DATETIME")
+        if 'rate_hourly_cents' not in columns:
+            logger.info("Adding normalized rate columns...")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN rate_hourly_cents INTEGER")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN rate_period VARCHAR(10)")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN rate_currency VARCHAR(3)")
+            backfill_rates(cursor)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_resume_submission_rate_hourly_cents "
+            "ON resume_submission (rate_hourly_cents)"
+        )
+        # create_all() makes the table; an empty one next to existing submissions
+        # means this database predates it. PRAGMA user_version records that the
+        # check has run, so a database whose contacts parse to nothing is not
+        # rescanned on every startup.
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] < CONTACTS_BACKFILLED:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'contact_point'")
+            if cursor.fetchone():
+                cursor.execute("SELECT 1 FROM contact_point LIMIT 1")
+                if cursor.fetchone() is None:
+                    backfill_contacts(cursor)
+                cursor.execute(f"PRAGMA user_version = {CONTACTS_BACKFILLED}")
+        if 'row_version' not in columns:
+            logger.info("Adding row_version column...")
+            cursor.execute("ALTER TABLE resume_submission ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1")
+        for date_column, day_column in DAY_COLUMNS.items():
+            if day_column not in columns:
+                logger.info(f"Adding {day_column} column...")
+                cursor.execute(f"ALTER TABLE resume_submission ADD COLUMN {day_column} INTEGER")
+                # julianday('1970-01-01') is 2440587.5
+                cursor.execute(
+                    f"UPDATE resume_submission SET {day_column} = "
+                    f"CAST(julianday(date({date_column})) - 2440587.5 AS INTEGER) "
+                    f"WHERE {date_column} IS NOT NULL"
+                )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_resume_submission_{day_column} "
+                f"ON resume_submission ({day_column})"
+            )
+
+        conn.commit()
+    finally:
+        conn.close()
+
 def ensure_database():
     try:
-        db_path = 'resume_tracker.db'
-        if not os.path.exists(db_path):
-            logger.info("Database does not exist. Creating...")
-            with app.app_context():
-                db.create_all()
-                logger.info("Database created successfully")
-        else:
-            logger.info("Database exists. Verifying schema...")
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(resume_submission)")
-                columns = [col[1] for col in cursor.fetchall()]
-                logger.info(f"Current columns: {columns}")
-                
-                if 'interview_date' not in columns:
-                    logger.info("Adding interview_date column...")
-                    cursor.execute("ALTER TABLE resume_submission ADD COLUMN interview_date DATETIME")
-                if 'follow_up_date' not in columns:
-                    logger.info("Adding follow_up_date column...")
-                    cursor.execute("ALTER TABLE resume_submission ADD COLUMN follow_up_date DATETIME")
-                
-                conn.commit()
-                logger.info("Database schema verified and updated if needed")
+        logger.info("Verifying database schema...")
+        db.create_all()
+        upgrade_schema(db.engine)
+        logger.info("Database schema verified and updated if needed")
+        if shard_router is not None:
+            shard_router.migrate_all()
     except Exception as e:
         logger.error(f"Error in ensure_database: {str(e)}\n{traceback.format_exc()}")
         raise
 
+shard_router = None
+if app.config['MULTI_TENANT']:
+    shard_router = ShardRouter(
+        app.config['SHARD_DIR'],
+        db.metadata,
+        upgrade_schema,
+        app.config['TENANTS'],
+        max_engines=app.config['SHARD_MAX_ENGINES']
+    )
+    app.extensions['shard_router'] = shard_router
+
+columnar_model = None
+if app.config['READ_MODEL']:
+    if shard_router is not None:
+        logger.warning("Read model is not available in multi-tenant mode; using SQLite for reads")
+    elif not read_model.available():
+        logger.warning("Read model needs numpy; using SQLite for reads")
+    else:
+        columnar_model = read_model.ColumnarReadModel()
+
+def active_read_model():
+    """The loaded read model, or None when reads should go to SQLite"""
+    if columnar_model is None or g.get('shard_engine') is not None:
+        return None
+    if not columnar_model.loaded:
+        columnar_model.load(db.session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    return columnar_model
+
+app.add_template_filter(link_contacts, 'contact_links')
+row_cache = fragments.FragmentCache(
+    lambda data: app.jinja_env.get_template('_submission_row.html').render(submission=data),
+    app.config['ROW_CACHE_SIZE']
+)
+
+def row_key(id):
+    # Ids repeat across tenant shards
+    return g.get('tenant'), id
+
+def row_fragment(item):
+    """Cached fragment for a ResumeSubmission or its to_dict() mapping"""
+    if isinstance(item, ResumeSubmission):
+        key, version = row_key(item.id), item.row_version
+    else:
+        key, version = row_key(item['id']), item['row_version']
+    fragment = row_cache.get(key, version)
+    if fragment is None:
+        fragment = row_cache.put(key, item.to_dict() if isinstance(item, ResumeSubmission) else item)
+    return fragment
+
+def listed_fragments(listing, batch_size=500):
+    """Fragments for (id, row_version) pairs, loading only the rows not already cached"""
+    found = {}
+    missing = []
+    for id, version in listing:
+        fragment = row_cache.get(row_key(id), version)
+        if fragment is None:
+            missing.append(id)
+        else:
+            found[id] = fragment
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        for submission in ResumeSubmission.query.filter(ResumeSubmission.id.in_(batch)):
+            found[submission.id] = row_cache.put(row_key(submission.id), submission.to_dict())
+    # A row deleted between the two queries is simply left out
+    return [found[id] for id, _ in listing if id in found]
+
 # Ensure database is properly set up
 with app.app_context():
     ensure_database()
 
+@app.before_request
+def route_to_shard():
+    router = app.extensions.get('shard_router')
+    if router is None or request.endpoint in ('static', 'serve_static', 'get_csrf_token'):
+        return None
+    tenant = tenant_from_request()
+    if not tenant:
+        message = "Multi-tenant mode: identify yourself with the X-Tracker-User header or ?user="
+        return jsonify({'status': 'error', 'message': message}), 400
+    try:
+        tenant = normalize_tenant(tenant)
+        g.shard_engine = router.engine_for(tenant)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except UnknownTenant as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 403
+    g.tenant = tenant
+    return None
+
 @app.after_request
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-CSRF-Token')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-CSRF-Token,X-Tracker-User')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     response.headers.add('Access-Control-Expose-Headers', 'X-CSRF-Token')
     return response
 
+def is_database_locked(error):
+    """SQLite gave up waiting for another connection's write lock"""
+    return isinstance(error, OperationalError) and 'locked' in str(error.orig)
+
+def database_locked():
+    """503 for a request that lost the race for the write lock; the client may retry"""
+    db.session.rollback()
+    logger.warning(f"Database is locked: {request.method} {request.path}")
+    return jsonify({'status': 'error', 'error': 'database_locked',
+                    'message': 'The database is busy. Please try again.'}), 503
+
+def index_rows(date_ranges):
+    listing = db.session.execute(
+        db.select(ResumeSubmission.id, ResumeSubmission.row_version)
+        .where(*date_range_filters(date_ranges))
+        .order_by(ResumeSubmission.submission_date.desc())
+    ).all()
+    logger.info(f"Found {len(listing)} submissions")
+    return fragments.assemble_rows(listed_fragments(listing))
+
 @app.route('/')
 def index():
     try:
         logger.info("Loading index page...")
-        submissions = ResumeSubmission.query.order_by(ResumeSubmission.submission_date.desc()).all()
-        logger.info(f"Found {len(submissions)} submissions")
-        return render_template('index.html', submissions=submissions)
+        date_ranges = parse_date_ranges(request.args)
+        return render_template('index.html', rows=index_rows(date_ranges))
+    except ValueError as e:
+        return render_template('error.html', error=str(e)), 400
     except Exception as e:
         logger.error(f"Error in index route: {str(e)}\n{traceback.format_exc()}")
         return render_template('error.html', error=str(e)), 500
@@ -157,12 +496,16 @@ def add_submission():
         )
         db.session.add(submission)
         db.session.commit()
+        if active_read_model() is not None:
+            columnar_model.upsert(submission.to_dict())
         logger.info(f"Added new submission: {submission.to_dict()}")
         return jsonify({'status': 'success', 'data': submission.to_dict()})
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
         logger.error(f"Error adding submission: {str(e)}\n{traceback.format_exc()}")
         db.session.rollback()
         return jsonify({'status': 'error', 'message': 'Failed to add submission. Please try again.'}), 500
@@ -215,12 +558,20 @@ def edit_submission(id):
         submission.notes = data.get('notes', '')
         
         db.session.commit()
+        row_cache.invalidate(row_key(id))
+        if active_read_model() is not None:
+            columnar_model.upsert(submission.to_dict())
         logger.info(f"Updated submission {id}: {submission.to_dict()}")
         return jsonify({'status': 'success', 'data': submission.to_dict()})
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'This submission was changed elsewhere. Reload and try again.'}), 409
     except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
         logger.error(f"Error editing submission: {str(e)}\n{traceback.format_exc()}")
         db.session.rollback()
         return jsonify({'status': 'error', 'message': 'Failed to update submission. Please try again.'}), 500
@@ -229,36 +580,544 @@ def edit_submission(id):
 def delete_submission(id):
     try:
         submission = ResumeSubmission.query.get_or_404(id)
+        unreferenced = release_blobs([attachment.sha256 for attachment in submission.attachments])
         db.session.delete(submission)
         db.session.commit()
+        collect_blobs(unreferenced)
+        row_cache.invalidate(row_key(id))
+        if active_read_model() is not None:
+            columnar_model.delete(id)
         logger.info(f"Deleted submission with id {id}")
         return jsonify({'status': 'success'})
+    except StaleDataError:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'This submission was changed elsewhere. Reload and try again.'}), 409
     except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
         logger.error(f"Error deleting submission: {str(e)}\n{traceback.format_exc()}")
         db.session.rollback()
         return jsonify({'status': 'error', 'message': 'Failed to delete submission. Please try again.'}), 500
 
-@app.route('/search')
-def search():
+def attachment_store():
+    """The blob store for the current database (each shard keeps its own)"""
+    root = app.config['ATTACHMENT_DIR']
+    if g.get('tenant'):
+        root = os.path.join(root, g.tenant)
+    return attachments.ContentStore(root)
+
+class UploadRequest(Request):
+    """Request whose uploaded files are written straight into the attachment store's tmp dir.
+
+    Werkzeug would otherwise buffer each file part in memory or a spooled temp
+    file, and upload_attachment would then copy it a second time while hashing.
+    The parse can run before route_to_shard (CSRFProtect reads the form), so
+    the shared tmp dir under ATTACHMENT_DIR is used; publish() moves the file
+    into the tenant's store on the same file system.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return attachments.ContentStore(app.config['ATTACHMENT_DIR']).incoming()
+
+app.request_class = UploadRequest
+
+def release_blobs(shas):
+    """Drop one reference per sha in the current transaction; return the shas left unreferenced"""
+    if not shas:
+        return []
+    blobs = AttachmentBlob.__table__
+    for sha256 in shas:
+        db.session.execute(
+            blobs.update().where(blobs.c.sha256 == sha256).values(ref_count=blobs.c.ref_count - 1)
+        )
+    unreferenced = db.session.execute(
+        db.select(blobs.c.sha256).where(blobs.c.sha256.in_(set(shas)), blobs.c.ref_count <= 0)
+    ).scalars().all()
+    if unreferenced:
+        db.session.execute(blobs.delete().where(blobs.c.sha256.in_(unreferenced)))
+    return unreferenced
+
+def collect_blobs(shas):
+    """After commit, remove files whose blob row is gone (and was not re-created since)"""
+    if not shas:
+        return
+    store = attachment_store()
+    with attachments.store_lock:
+        for sha256 in shas:
+            if db.session.get(AttachmentBlob, sha256) is None:
+                store.delete(sha256)
+
+@app.route('/submissions/<int:id>/attachments', methods=['POST'])
+def upload_attachment(id):
+    store = attachment_store()
+    tmp_path = None
     try:
-        query = request.args.get('query', '').lower()
+        submission = db.session.get(ResumeSubmission, id)
+        if submission is None:
+            return jsonify({'status': 'error', 'message': 'Submission not found.'}), 404
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            raise ValueError("No file received")
+
+        if isinstance(upload.stream, attachments.IncomingFile):
+            # UploadRequest already wrote and hashed it during form parsing
+            tmp_path, sha256, size = upload.stream.finish()
+        else:
+            tmp_path, sha256, size = store.receive(upload.stream)
+        db.session.execute(
+            sqlite_insert(AttachmentBlob.__table__)
+            .values(sha256=sha256, size=size, ref_count=1)
+            .on_conflict_do_update(
+                index_elements=['sha256'],
+                set_={'ref_count': AttachmentBlob.__table__.c.ref_count + 1}
+            )
+        )
+        attachment = Attachment(
+            submission_id=submission.id,
+            sha256=sha256,
+            filename=secure_filename(upload.filename) or 'attachment',
+            content_type=upload.mimetype or 'application/octet-stream',
+            size=size,
+            uploaded_at=datetime.now()
+        )
+        db.session.add(attachment)
+        with attachments.store_lock:
+            db.session.commit()
+            stored = store.publish(tmp_path, sha256)
+        tmp_path = None
+        logger.info(f"Attached {attachment.filename} ({size} bytes, {'new' if stored else 'deduplicated'}) "
+                    f"to submission {id}")
+        return jsonify({'status': 'success', 'data': attachment.to_dict(), 'deduplicated': not stored}), 201
+    except ValueError as e:
+        logger.error(f"Validation error: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
+        logger.error(f"Error uploading attachment: {str(e)}\n{traceback.format_exc()}")
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'Failed to upload attachment. Please try again.'}), 500
+    finally:
+        if tmp_path:
+            store.discard(tmp_path)
+
+@app.route('/submissions/<int:id>/attachments')
+def list_attachments(id):
+    try:
+        rows = Attachment.query.filter_by(submission_id=id).order_by(Attachment.uploaded_at).all()
+        return jsonify([attachment.to_dict() for attachment in rows])
+    except Exception as e:
+        logger.error(f"Error listing attachments: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to list attachments. Please try again.'}), 500
+
+@app.route('/attachments/<int:attachment_id>')
+def download_attachment(attachment_id):
+    attachment = db.session.get(Attachment, attachment_id)
+    if attachment is None:
+        return jsonify({'status': 'error', 'message': 'Attachment not found.'}), 404
+    path = attachment_store().path_for(attachment.sha256)
+    if not os.path.exists(path):
+        logger.error(f"Blob {attachment.sha256} for attachment {attachment_id} is missing")
+        return jsonify({'status': 'error', 'message': 'Attachment file is missing.'}), 404
+    # conditional=True answers Range requests with 206; the file itself goes out
+    # through the server's wsgi.file_wrapper (sendfile) or X-Sendfile when enabled
+    return send_file(
+        path,
+        mimetype=attachment.content_type,
+        as_attachment=True,
+        download_name=attachment.filename,
+        conditional=True,
+        etag=attachment.sha256
+    )
+
+@app.route('/attachments/<int:attachment_id>/delete', methods=['POST'])
+def delete_attachment(attachment_id):
+    try:
+        attachment = db.session.get(Attachment, attachment_id)
+        if attachment is None:
+            return jsonify({'status': 'error', 'message': 'Attachment not found.'}), 404
+        unreferenced = release_blobs([attachment.sha256])
+        db.session.delete(attachment)
+        db.session.commit()
+        collect_blobs(unreferenced)
+        logger.info(f"Deleted attachment {attachment_id}")
+        return jsonify({'status': 'success'})
+    except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
+        logger.error(f"Error deleting attachment: {str(e)}\n{traceback.format_exc()}")
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'Failed to delete attachment. Please try again.'}), 500
+
+@app.route('/stats/attachments')
+def attachment_stats():
+    """How much disk content addressing saves: bytes uploaded vs bytes stored"""
+    logical_bytes = db.session.query(db.func.coalesce(db.func.sum(Attachment.size), 0)).scalar()
+    stored_bytes = db.session.query(db.func.coalesce(db.func.sum(AttachmentBlob.size), 0)).scalar()
+    return jsonify({
+        'attachments': db.session.query(db.func.count(Attachment.id)).scalar(),
+        'blobs': db.session.query(db.func.count(AttachmentBlob.sha256)).scalar(),
+        'logical_bytes': logical_bytes,
+        'stored_bytes': stored_bytes,
+        'saved_bytes': logical_bytes - stored_bytes,
+        'dedup_ratio': round(logical_bytes / stored_bytes, 2) if stored_bytes else None
+    })
+
+DATE_RANGE_FIELDS = ('submission_date', 'interview_date', 'follow_up_date')
+
+def parse_date_ranges(args):
+    """Read inclusive <field>_from / <field>_to (YYYY-MM-DD) filters as epoch-day pairs"""
+    ranges = {}
+    for field in DATE_RANGE_FIELDS:
+        bounds = []
+        for suffix in ('from', 'to'):
+            value = args.get(f'{field}_{suffix}')
+            try:
+                bounds.append(to_epoch_day(value) if value else None)
+            except ValueError:
+                raise ValueError(f"Invalid {field}_{suffix} date format")
+        if bounds != [None, None]:
+            ranges[field] = tuple(bounds)
+    return ranges
+
+def parse_rate_currency(args):
+    """Read ?currency= (default USD); rates are only compared within one currency"""
+    currency = args.get('currency', rates.DEFAULT_CURRENCY).upper()
+    if currency not in rates.CURRENCY_CODES:
+        raise ValueError(f"Invalid currency: expected one of {', '.join(rates.CURRENCY_CODES)}")
+    return currency
+
+def parse_rate_range(args):
+    """Read min_rate / max_rate (per hour, in ?currency=) as (low cents, high cents, currency)"""
+    bounds = []
+    for name in ('min_rate', 'max_rate'):
+        value = args.get(name)
+        try:
+            bounds.append(int(round(float(value) * 100)) if value else None)
+        except ValueError:
+            raise ValueError(f"Invalid {name}: expected an amount per hour")
+    if bounds == [None, None] and 'currency' not in args:
+        return None
+    return (*bounds, parse_rate_currency(args))
+
+def rate_range_filters(rate_range):
+    """Conditions for rows with a parsed rate in the range's currency and bounds"""
+    low, high, currency = rate_range
+    filters = [ResumeSubmission.rate_hourly_cents.isnot(None), ResumeSubmission.rate_currency == currency]
+    if low is not None:
+        filters.append(ResumeSubmission.rate_hourly_cents >= low)
+    if high is not None:
+        filters.append(ResumeSubmission.rate_hourly_cents <= high)
+    return filters
+
+def date_range_filters(ranges):
+    """Range conditions on the indexed epoch-day columns"""
+    filters = []
+    for field, (start, end) in ranges.items():
+        column = getattr(ResumeSubmission, DAY_COLUMNS[field])
+        filters.append(column.isnot(None))
+        if start is not None:
+            filters.append(column >= start)
+        if end is not None:
+            filters.append(column <= end)
+    return filters
+
+SEARCH_COLUMNS = ('recruiter_firm', 'client_name', 'recruiter_name', 'recruiter_contact',
+                  'job_id', 'position', 'rate')
+
+def range_shape(date_ranges, rate_range):
+    """Which range bounds are present; part of the statement cache key"""
+    dates = tuple((field, start is not None, end is not None)
+                  for field, (start, end) in sorted(date_ranges.items()))
+    rate = None if rate_range is None else tuple(bound is not None for bound in rate_range[:2])
+    return dates, rate
+
+def range_params(date_ranges, rate_range):
+    params = {}
+    for field, (start, end) in date_ranges.items():
+        params[f'{field}_from'], params[f'{field}_to'] = start, end
+    if rate_range is not None:
+        params['min_rate'], params['max_rate'], params['rate_currency'] = rate_range
+    return params
+
+def build_search_statement(parsed, ranges):
+    """SELECT for one query shape, with every literal left as a bindparam"""
+    conditions = []
+    if parsed.text:
+        conditions.append(db.or_(*(getattr(ResumeSubmission, column).ilike(bindparam('text'))
+                                   for column in SEARCH_COLUMNS)))
+    values = 0
+    for term in parsed.terms:
+        column = getattr(ResumeSubmission, term.column)
+        if term.kind == 'has':
+            is_set = column.isnot(None)
+            if isinstance(column.type, db.String):
+                # /add stores blank text fields as '', which counts as unset
+                is_set = is_set & (column != '')
+            conditions.append(~is_set if term.negated else is_set)
+            continue
+        condition = column.ilike(bindparam(f'v{values}'))
+        values += 1
+        conditions.append(db.or_(column.is_(None), ~condition) if term.negated else condition)
+
+    dates, rate = ranges
+    for field, has_start, has_end in dates:
+        column = getattr(ResumeSubmission, DAY_COLUMNS[field])
+        conditions.append(column.isnot(None))
+        if has_start:
+            conditions.append(column >= bindparam(f'{field}_from'))
+        if has_end:
+            conditions.append(column <= bindparam(f'{field}_to'))
+    if rate is not None:
+        column = ResumeSubmission.rate_hourly_cents
+        conditions.append(column.isnot(None))
+        conditions.append(ResumeSubmission.rate_currency == bindparam('rate_currency'))
+        if rate[0]:
+            conditions.append(column >= bindparam('min_rate'))
+        if rate[1]:
+            conditions.append(column <= bindparam('max_rate'))
+
+    order = []
+    if parsed.sort is not None:
+        column, descending = parsed.sort
+        column = getattr(ResumeSubmission, column)
+        order = [column.is_(None), column.desc() if descending else column.asc()]
+    order.append(ResumeSubmission.submission_date.desc())
+    return db.select(ResumeSubmission).where(*conditions).order_by(*order)
+
+def search_submissions(query, date_ranges=None, rate_range=None):
+    """Run a filter-language query (see query_lang.parse) through the statement cache"""
+    date_ranges = date_ranges or {}
+    parsed, statement = query_cache.prepare(query, range_shape(date_ranges, rate_range), build_search_statement)
+    params = parsed.params()
+    params.update(range_params(date_ranges, rate_range))
+    submissions = db.session.execute(statement, params).scalars().all()
+    logger.info(f"Found {len(submissions)} submissions matching query '{query}'")
+    return [row_fragment(submission).data for submission in submissions]
+
+def build_listing_statement(parsed, ranges):
+    """The search statement narrowed to (id, row_version), for assembling cached fragments"""
+    return build_search_statement(parsed, ranges[1]).with_only_columns(
+        ResumeSubmission.id, ResumeSubmission.row_version
+    )
+
+def search_listing(query, date_ranges=None, rate_range=None):
+    """(id, row_version) pairs matching a filter-language query, in result order"""
+    date_ranges = date_ranges or {}
+    shape = ('listing', range_shape(date_ranges, rate_range))
+    parsed, statement = query_cache.prepare(query, shape, build_listing_statement)
+    params = parsed.params()
+    params.update(range_params(date_ranges, rate_range))
+    listing = db.session.execute(statement, params).all()
+    logger.info(f"Found {len(listing)} submissions matching query '{query}'")
+    return listing
+
+def read_model_search(model, query, date_ranges, rate_range):
+    parsed = query_cache.parse(query)
+    return model.search(parsed.text, date_ranges, rate_range, parsed.filters(), parsed.sort)
+
+CONTACT_LOOKUPS = {
+    'email': contacts.normalize_email,
+    'phone': contacts.normalize_phone,
+    'url': contacts.normalize_url
+}
+
+@app.route('/contact')
+def contact_lookup():
+    """Submissions whose contact info includes ?email=, ?phone= or ?url= (exact, after normalizing)"""
+    try:
+        given = [kind for kind in CONTACT_LOOKUPS if request.args.get(kind)]
+        if len(given) != 1:
+            raise ValueError("Pass exactly one of email, phone or url")
+        kind = given[0]
+        value = CONTACT_LOOKUPS[kind](request.args[kind])
+        if not value:
+            raise ValueError(f"Invalid {kind}: {request.args[kind]}")
         submissions = ResumeSubmission.query.filter(
-            db.or_(
-                ResumeSubmission.recruiter_firm.ilike(f'%{query}%'),
-                ResumeSubmission.client_name.ilike(f'%{query}%'),
-                ResumeSubmission.recruiter_name.ilike(f'%{query}%'),
-                ResumeSubmission.recruiter_contact.ilike(f'%{query}%'),
-                ResumeSubmission.job_id.ilike(f'%{query}%'),
-                ResumeSubmission.position.ilike(f'%{query}%'),
-                ResumeSubmission.rate.ilike(f'%{query}%')
+            ResumeSubmission.id.in_(
+                db.select(ContactPoint.submission_id).where(ContactPoint.kind == kind, ContactPoint.value == value)
             )
         ).order_by(ResumeSubmission.submission_date.desc()).all()
-        logger.info(f"Found {len(submissions)} submissions matching query '{query}'")
-        return jsonify([submission.to_dict() for submission in submissions])
+        logger.info(f"Found {len(submissions)} submissions for {kind} {value}")
+        return jsonify({kind: value, 'submissions': [row_fragment(submission).data for submission in submissions]})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
+        logger.error(f"Error looking up contact: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to look up contact. Please try again.'}), 500
+
+def search_response(query, date_ranges, rate_range):
+    """JSON rows, or with ?format=html the table rows assembled from cached fragments"""
+    model = active_read_model()
+    if request.args.get('format') == 'html':
+        if model is not None:
+            found = [row_fragment(row) for row in read_model_search(model, query, date_ranges, rate_range)]
+        else:
+            # Like index_rows: only rows missing from the cache are loaded in full
+            found = listed_fragments(search_listing(query, date_ranges, rate_range))
+        return app.response_class(fragments.assemble_rows(found), mimetype='text/html')
+    if model is not None:
+        return jsonify(read_model_search(model, query, date_ranges, rate_range))
+    return jsonify(search_submissions(query, date_ranges, rate_range))
+
+@app.route('/search')
+def search():
+    try:
+        query = request.args.get('query', '').lower()
+        date_ranges = parse_date_ranges(request.args)
+        rate_range = parse_rate_range(request.args)
+        return search_response(query, date_ranges, rate_range)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        if is_database_locked(e):
+            return database_locked()
         logger.error(f"Error searching submissions: {str(e)}\n{traceback.format_exc()}")
         return jsonify({'status': 'error', 'message': 'Failed to search submissions. Please try again.'}), 500
 
+def submission_stats(date_ranges=None):
+    """Aggregate counts straight from SQLite (the read model's stats() mirrors this)"""
+    filters = date_range_filters(date_ranges or {})
+
+    def counts(column):
+        rows = db.session.query(column, db.func.count()).filter(*filters).group_by(column).all()
+        return {value: count for value, count in rows if value is not None}
+
+    base = db.session.query(db.func.count()).select_from(ResumeSubmission).filter(*filters)
+    return {
+        'total': base.scalar(),
+        'with_interview': base.filter(ResumeSubmission.interview_date.isnot(None)).scalar(),
+        'with_follow_up': base.filter(ResumeSubmission.follow_up_date.isnot(None)).scalar(),
+        'by_firm': counts(ResumeSubmission.recruiter_firm),
+        'by_position': counts(ResumeSubmission.position),
+        'by_month': counts(db.func.strftime('%Y-%m', ResumeSubmission.submission_date))
+    }
+
+@app.route('/stats')
+def stats():
+    try:
+        date_ranges = parse_date_ranges(request.args)
+        model = active_read_model()
+        if model is not None:
+            return jsonify(model.stats(date_ranges))
+        return jsonify(submission_stats(date_ranges))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error computing stats: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to compute stats. Please try again.'}), 500
+
+def rate_stats(date_ranges=None, currency=rates.DEFAULT_CURRENCY):
+    """Hourly rate percentiles and histograms overall, per firm and per position, for one currency"""
+    rows = db.session.query(
+        ResumeSubmission.recruiter_firm,
+        ResumeSubmission.position,
+        ResumeSubmission.rate_hourly_cents
+    ).filter(
+        *rate_range_filters((None, None, currency)),
+        *date_range_filters(date_ranges or {})
+    ).order_by(ResumeSubmission.rate_hourly_cents).all()
+
+    by_firm, by_position = {}, {}
+    for firm, position, cents in rows:
+        by_firm.setdefault(firm, []).append(cents)
+        by_position.setdefault(position, []).append(cents)
+    return {
+        'currency': currency,
+        'overall': rates.summarize([row[2] for row in rows]),
+        'by_firm': {firm: rates.summarize(values) for firm, values in by_firm.items()},
+        'by_position': {position: rates.summarize(values) for position, values in by_position.items()}
+    }
+
+@app.route('/stats/rates')
+def stats_rates():
+    try:
+        date_ranges = parse_date_ranges(request.args)
+        currency = parse_rate_currency(request.args)
+        model = active_read_model()
+        if model is not None:
+            return jsonify(model.rate_stats(date_ranges, currency))
+        return jsonify(rate_stats(date_ranges, currency))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error computing rate stats: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to compute rate stats. Please try again.'}), 500
+
+@app.route('/stats/read_model')
+def read_model_consistency():
+    """Check the in-memory read model row by row against SQLite"""
+    model = active_read_model()
+    if model is None:
+        return jsonify({'enabled': False})
+    problems = model.verify(db.session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    return jsonify({'enabled': True, 'rows': len(model), 'consistent': not problems, 'problems': problems[:100]})
+
+@app.route('/stats/query_cache')
+def query_cache_stats():
+    return jsonify(query_cache.stats())
+
+@app.route('/stats/row_cache')
+def row_cache_stats():
+    return jsonify(row_cache.stats())
+
+@app.route('/stats/executor')
+def executor_stats():
+    return jsonify(db_executor.stats())
+
+_running_backups = set()
+_running_backups_lock = threading.Lock()
+
+def backup_dir():
+    """Snapshot directory for the current database (each shard keeps its own)"""
+    root = app.config['BACKUP_DIR']
+    if g.get('tenant'):
+        root = os.path.join(root, g.tenant)
+    return root
+
+def _run_backup(db_path, snapshot_dir):
+    try:
+        backup.backup_database(db_path, snapshot_dir, keep=app.config['BACKUP_KEEP'])
+    except Exception as e:
+        logger.error(f"Error backing up {db_path}: {str(e)}\n{traceback.format_exc()}")
+    finally:
+        with _running_backups_lock:
+            _running_backups.discard(db_path)
+
+@app.route('/backup', methods=['POST'])
+def start_backup():
+    try:
+        db_path = db.session.get_bind().url.database
+        with _running_backups_lock:
+            if db_path in _running_backups:
+                return jsonify({'status': 'error', 'message': 'A backup is already running.'}), 409
+            _running_backups.add(db_path)
+        # The copy runs in small steps on its own thread so requests keep being served
+        threading.Thread(target=_run_backup, args=(db_path, backup_dir()), daemon=True).start()
+        logger.info(f"Started online backup of {db_path}")
+        return jsonify({'status': 'started'}), 202
+    except Exception as e:
+        logger.error(f"Error starting backup: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to start backup. Please try again.'}), 500
+
+@app.route('/backups')
+def list_backups():
+    try:
+        db_path = db.session.get_bind().url.database
+        snapshots = backup.list_snapshots(backup_dir(), db_path)
+        with _running_backups_lock:
+            running = db_path in _running_backups
+        return jsonify({
+            'running': running,
+            'snapshots': [
+                {'name': os.path.basename(path), 'bytes': os.path.getsize(path)}
+                for path in snapshots
+            ]
+        })
+    except Exception as e:
+        logger.error(f"Error listing backups: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'status': 'error', 'message': 'Failed to list backups. Please try again.'}), 500
+
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     try:
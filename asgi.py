@@ -0,0 +1,122 @@
+"""ASGI entry point: serve the app from an event loop.
+
+    python run_app.py --asgi          (needs uvicorn and asgiref)
+    uvicorn asgi:application
+
+Under the threaded server every request holds a thread for as long as its
+SQLite query runs. Here GET / and /search are parked as coroutines on the
+event loop and only handed to the bounded DB executor to run, so thousands of
+waiting readers share DB_EXECUTOR_WORKERS threads; when the executor's queue
+is full they get a 503 straight away. Everything else (posts, uploads,
+downloads) goes through asgiref's WsgiToAsgi, a thread per request as before.
+"""
+import io
+import sys
+import json
+import asyncio
+from collections import defaultdict
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, db_executor
+from db_executor import ExecutorSaturated
+
+# Read-only pages whose whole request runs on the DB executor
+READ_PATHS = ('/', '/search')
+
+BUSY_BODY = json.dumps({'status': 'error', 'message': 'Server is busy. Please try again.'}).encode()
+
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope and its (already read) body"""
+    script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+    path_info = scope['path'].encode('utf8').decode('latin1')
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    headers = defaultdict(list)
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name in ('content-type', 'content-length'):
+            key = name.upper().replace('-', '_')
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        headers[key].append(value.decode('latin1'))
+    environ.update((key, ','.join(values)) for key, values in headers.items())
+    return environ
+
+
+def call_wsgi(wsgi_app, environ):
+    """Run one WSGI request to completion and return (status, headers, body)"""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+        return chunks.append
+
+    result = wsgi_app(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], b''.join(chunks)
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] != 'http.request':
+            return body
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+class ResumeTrackerAsgi:
+    """ASGI app that awaits the DB executor for READ_PATHS and wraps the WSGI app for the rest"""
+
+    def __init__(self, wsgi_app, executor, read_paths=READ_PATHS):
+        self.wsgi_app = wsgi_app
+        self.executor = executor
+        self.read_paths = read_paths
+        self._threaded = WsgiToAsgi(wsgi_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET' or scope['path'] not in self.read_paths:
+            return await self._threaded(scope, receive, send)
+
+        environ = build_environ(scope, await _read_body(receive))
+        try:
+            future = self.executor.submit(call_wsgi, self.wsgi_app, environ)
+        except ExecutorSaturated:
+            status, headers, body = 503, [(b'content-type', b'application/json')], BUSY_BODY
+        else:
+            # The coroutine waits here without holding a thread
+            status, headers, body = await asyncio.wrap_future(future)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+application = ResumeTrackerAsgi(app, db_executor)
@@ -0,0 +1,121 @@
+import os
+import uuid
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Serializes "commit + publish" on upload against "check + unlink" in garbage
+# collection, so a blob is never removed just as a new reference to it lands.
+store_lock = threading.Lock()
+
+
+class IncomingFile:
+    """Temp file that hashes what is written to it, used as Werkzeug's upload stream.
+
+    The form parser writes each file part straight into it (sequentially, from
+    the start) and seeks back to 0, so the upload is on disk and hashed without
+    a second copy. Closing it removes the file unless finish() handed it over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._file = open(path, 'w+b')
+        self._kept = False
+
+    def write(self, data):
+        self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def finish(self):
+        """Close the file and return (tmp_path, sha256, size) for publish()"""
+        self._file.close()
+        self._kept = True
+        return self.path, self._digest.hexdigest(), self.size
+
+    def close(self):
+        self._file.close()
+        if not self._kept:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush/closed... go to the underlying file
+        return getattr(self._file, name)
+
+
+class ContentStore:
+    """Files on local disk addressed by the SHA-256 of their content.
+
+    Identical uploads share one file at <root>/<ab>/<cd>/<sha256>. Uploads are
+    streamed to a temp file while being hashed, then published under their
+    hash; if that hash is already stored the temp file is simply dropped.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256):
+        return os.path.exists(self.path_for(sha256))
+
+    def incoming(self):
+        """A new IncomingFile in tmp_dir"""
+        return IncomingFile(os.path.join(self.tmp_dir, uuid.uuid4().hex))
+
+    def receive(self, stream, chunk_size=CHUNK_SIZE):
+        """Copy a file-like stream to a temp file in chunks; return (tmp_path, sha256, size)"""
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        try:
+            with open(tmp_path, 'wb') as out:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            self.discard(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    def publish(self, tmp_path, sha256):
+        """Move a received file into place, or drop it if the content is already stored.
+
+        Returns True when a new file was stored.
+        """
+        final = self.path_for(sha256)
+        if os.path.exists(final):
+            self.discard(tmp_path)
+            return False
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        os.replace(tmp_path, final)
+        return True
+
+    def discard(self, tmp_path):
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def delete(self, sha256):
+        try:
+            os.remove(self.path_for(sha256))
+            logger.info(f"Removed unreferenced blob {sha256}")
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,172 @@
+import os
+import re
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES = 256       # pages copied per step (~1 MB with 4 KB pages)
+DEFAULT_PAUSE = 0.005     # seconds to yield to writers between steps
+DEFAULT_KEEP = 10         # snapshots kept per database
+
+
+def _snapshot_stem(db_path):
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def _snapshot_pattern(db_path):
+    """Exact snapshot names of db_path, so "alice" never matches "alice-2"'s snapshots"""
+    return re.compile(rf'^{re.escape(_snapshot_stem(db_path))}-\d{{8}}-\d{{6}}-\d{{6}}\.db$')
+
+
+def integrity_check(path):
+    """Run PRAGMA integrity_check on a database file and return its verdict"""
+    with sqlite3.connect(path) as conn:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    conn.close()
+    return result
+
+
+def _copy(src, dst, pages, pause):
+    """Copy src into dst in page-sized steps, sleeping between steps.
+
+    The source is only read-locked while a step runs, so writers on other
+    connections get a chance in every pause instead of waiting for the whole copy.
+    """
+    def progress(status, remaining, total):
+        if remaining:
+            time.sleep(pause)
+
+    src.backup(dst, pages=pages, progress=progress)
+
+
+def list_snapshots(backup_dir, db_path):
+    """Snapshots of db_path in backup_dir, newest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    pattern = _snapshot_pattern(db_path)
+    names = [name for name in os.listdir(backup_dir) if pattern.match(name)]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+
+def prune_snapshots(backup_dir, db_path, keep=DEFAULT_KEEP):
+    """Delete all but the newest `keep` snapshots of db_path"""
+    removed = []
+    for path in list_snapshots(backup_dir, db_path)[keep:]:
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def backup_database(db_path, backup_dir, pages=DEFAULT_PAGES, pause=DEFAULT_PAUSE, keep=DEFAULT_KEEP):
+    """Take an online snapshot of a live database with the SQLite backup API.
+
+    The snapshot is written under a temporary name, checked with
+    PRAGMA integrity_check and only then given its final name, so a listed
+    snapshot is always a complete one.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    snapshot = os.path.join(backup_dir, f'{_snapshot_stem(db_path)}-{stamp}.db')
+    partial = snapshot + '.partial'
+
+    started = time.perf_counter()
+    src = sqlite3.connect(db_path)
+    dst = sqlite3.connect(partial)
+    try:
+        _copy(src, dst, pages, pause)
+    finally:
+        dst.close()
+        src.close()
+
+    verdict = integrity_check(partial)
+    if verdict != 'ok':
+        os.remove(partial)
+        raise RuntimeError(f"Snapshot of {db_path} failed integrity check: {verdict}")
+    os.replace(partial, snapshot)
+
+    pruned = prune_snapshots(backup_dir, db_path, keep)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(snapshot)
+    logger.info(f"Backed up {db_path} to {snapshot} ({size} bytes in {elapsed:.2f}s)")
+    return {
+        'snapshot': snapshot,
+        'bytes': size,
+        'seconds': round(elapsed, 3),
+        'pruned': pruned
+    }
+
+
+def restore_database(snapshot, db_path, pages=DEFAULT_PAGES, pause=DEFAULT_PAUSE):
+    """Copy a verified snapshot back over a (possibly open) live database"""
+    verdict = integrity_check(snapshot)
+    if verdict != 'ok':
+        raise RuntimeError(f"Refusing to restore {snapshot}: integrity check returned {verdict}")
+
+    src = sqlite3.connect(snapshot)
+    dst = sqlite3.connect(db_path, timeout=30)
+    try:
+        _copy(src, dst, pages, pause)
+    finally:
+        dst.close()
+        src.close()
+    logger.info(f"Restored {db_path} from {snapshot}")
+
+
+def _default_paths():
+    from app import app, db
+
+    with app.app_context():
+        db_path = db.engine.url.database
+    return db_path, app.config['BACKUP_DIR']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Online backup and restore for the Resume Tracker database")
+    parser.add_argument('--db', help="database file (default: the app's database)")
+    parser.add_argument('--dir', help="snapshot directory (default: instance/backups)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backup_cmd = commands.add_parser('backup', help="take a snapshot of the live database")
+    backup_cmd.add_argument('--keep', type=int, default=DEFAULT_KEEP, help="snapshots to retain")
+    backup_cmd.add_argument('--pages', type=int, default=DEFAULT_PAGES, help="pages copied per step")
+
+    commands.add_parser('list', help="list snapshots, newest first")
+
+    restore_cmd = commands.add_parser('restore', help="restore the database from a snapshot")
+    restore_cmd.add_argument('snapshot', nargs='?', help="snapshot file (default: the newest)")
+
+    args = parser.parse_args(argv)
+    db_path, backup_dir = args.db, args.dir
+    if not db_path or not backup_dir:
+        default_db, default_dir = _default_paths()
+        db_path = db_path or default_db
+        backup_dir = backup_dir or default_dir
+
+    if args.command == 'backup':
+        result = backup_database(db_path, backup_dir, pages=args.pages, keep=args.keep)
+        print(f"Snapshot written to {result['snapshot']} ({result['bytes']} bytes in {result['seconds']}s)")
+        for path in result['pruned']:
+            print(f"Removed old snapshot {path}")
+    elif args.command == 'list':
+        for path in list_snapshots(backup_dir, db_path):
+            print(path)
+    elif args.command == 'restore':
+        snapshot = args.snapshot
+        if not snapshot:
+            snapshots = list_snapshots(backup_dir, db_path)
+            if not snapshots:
+                print(f"No snapshots of {db_path} found in {backup_dir}")
+                return 1
+            snapshot = snapshots[0]
+        restore_database(snapshot, db_path)
+        print(f"Restored {db_path} from {snapshot}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
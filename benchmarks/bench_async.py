@@ -0,0 +1,92 @@
+"""Compare /search on the threaded server and on the ASGI event loop under the same offline load.
+
+Starts run_app.py twice against one seeded scratch database, once with the
+default threaded server and once with --asgi (uvicorn serving asgi.py, where
+waiting requests are coroutines and only the bounded DB executor's threads run
+queries), and drives /search at rising concurrency. Prints throughput, tail
+latency and rejection rate for each, plus the DB executor's queue and
+saturation counters in ASGI mode. Needs uvicorn for the second half.
+
+    python benchmarks/bench_async.py --rows 20000 --concurrency 8 32 128
+"""
+import os
+import sqlite3
+import importlib.util
+import argparse
+import tempfile
+import urllib.request
+
+import loadgen
+
+QUERIES = ['staffing', 'engineer', 'client 1', 'job9', 'zzz-no-match']
+
+
+def seed(db_path, rows):
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO resume_submission (recruiter_firm, client_name, recruiter_name, recruiter_contact, "
+            "submission_date, job_id, position, rate, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(f'Firm {i % 97} Staffing', f'Client {i % 31}', f'Recruiter {i % 53}', f'r{i}@example.com',
+              f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} 00:00:00.000000', f'JOB{i}',
+              ('Software Engineer', 'Data Analyst', 'DevOps Engineer')[i % 3], f'${40 + i % 60}/hr', '')
+             for i in range(rows)]
+        )
+    conn.close()
+
+
+def search_worker(base_url):
+    def worker(stop, record):
+        opener = urllib.request.build_opener()
+        i = 0
+        while not stop.is_set():
+            query = QUERIES[i % len(QUERIES)]
+            i += 1
+            status, body, seconds = loadgen.request(opener, 'GET', f'{base_url}/search?query={urllib.request.quote(query)}')
+            record('/search', status, seconds, body)
+    return worker
+
+
+def bench_mode(label, db_path, env, levels, duration, args=()):
+    process, base_url = loadgen.start_server(db_path, env=env, args=args)
+    try:
+        for concurrency in levels:
+            samples, elapsed = loadgen.run_load(search_worker(base_url), concurrency, duration)
+            summary = loadgen.summarize(samples, elapsed)
+            loadgen.print_summary(f"{label} - concurrency {concurrency}", {'/search': summary['/search']})
+        if '--asgi' in args:
+            stats = loadgen.fetch_json(base_url + '/stats/executor')
+            print(f"\nDB executor: peak queued {stats['peak_queued']}, rejected {stats['rejected']}, "
+                  f"avg wait {stats['avg_wait_ms']} ms, avg run {stats['avg_run_ms']} ms")
+    finally:
+        loadgen.stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds per concurrency level")
+    parser.add_argument('--workers', type=int, default=4, help="DB executor threads in ASGI mode")
+    parser.add_argument('--queue', type=int, default=64, help="DB executor queue depth in ASGI mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = os.path.join(scratch, 'bench.db')
+        # First start creates the schema; seed it before measuring anything
+        process, _ = loadgen.start_server(db_path)
+        loadgen.stop_server(process)
+        seed(db_path, args.rows)
+        print(f"Seeded {args.rows} rows")
+
+        bench_mode('threaded server', db_path, {}, args.concurrency, args.duration)
+        if importlib.util.find_spec('uvicorn') is None:
+            print("\nuvicorn is not installed; skipping the ASGI run (pip install uvicorn)")
+            return
+        bench_mode('asgi', db_path, {
+            'RESUME_TRACKER_DB_WORKERS': str(args.workers),
+            'RESUME_TRACKER_DB_QUEUE': str(args.queue)
+        }, args.concurrency, args.duration, args=('--asgi',))
+
+
+if __name__ == '__main__':
+    main()
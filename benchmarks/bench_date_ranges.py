@@ -0,0 +1,93 @@
+"""Range queries on the DATETIME text columns vs the indexed epoch-day columns.
+
+Builds a scratch table shaped like resume_submission, then times the same
+"last 30 days" / "this week" / "this quarter" questions asked both ways.
+
+    python benchmarks/bench_date_ranges.py --rows 500000
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from epoch_days import to_epoch_day  # noqa: E402
+
+CASES = [
+    ('submissions last 30 days', 'submission', date(2025, 6, 1), date(2025, 6, 30)),
+    ('interviews this week', 'interview', date(2025, 6, 23), date(2025, 6, 29)),
+    ('follow-ups this quarter', 'follow_up', date(2025, 4, 1), date(2025, 6, 30)),
+]
+
+
+def seed(conn, rows):
+    conn.execute(
+        "CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, recruiter_firm TEXT, "
+        "submission_date DATETIME, interview_date DATETIME, follow_up_date DATETIME, "
+        "submission_day INTEGER, interview_day INTEGER, follow_up_day INTEGER)"
+    )
+    start = date(2020, 1, 1)
+
+    def row(i):
+        submitted = start + timedelta(days=i % 2000)
+        interview = submitted + timedelta(days=7) if i % 5 == 0 else None
+        follow_up = submitted + timedelta(days=14) if i % 3 == 0 else None
+        as_text = lambda value: value and f'{value} 00:00:00.000000'
+        return (f'Firm {i % 97}', as_text(submitted), as_text(interview), as_text(follow_up),
+                to_epoch_day(submitted), to_epoch_day(interview), to_epoch_day(follow_up))
+
+    conn.executemany(
+        "INSERT INTO resume_submission (recruiter_firm, submission_date, interview_date, follow_up_date, "
+        "submission_day, interview_day, follow_up_day) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (row(i) for i in range(rows))
+    )
+    for name in ('submission', 'interview', 'follow_up'):
+        conn.execute(f"CREATE INDEX ix_{name}_day ON resume_submission ({name}_day)")
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def timed(conn, sql, params, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        conn = sqlite3.connect(os.path.join(scratch, 'bench.db'))
+        seed(conn, args.rows)
+        print(f"Seeded {args.rows} rows\n")
+        print(f"{'case':<28}{'rows':>8}{'text ms':>10}{'day ms':>10}{'speedup':>9}")
+        for label, field, start, end in CASES:
+            text_ms, text_rows = timed(
+                conn,
+                f"SELECT id FROM resume_submission WHERE {field}_date >= ? AND {field}_date < ?",
+                (str(start), str(end + timedelta(days=1))),
+                args.repeat
+            )
+            day_ms, day_rows = timed(
+                conn,
+                f"SELECT id FROM resume_submission WHERE {field}_day BETWEEN ? AND ?",
+                (to_epoch_day(start), to_epoch_day(end)),
+                args.repeat
+            )
+            assert text_rows == day_rows, label
+            print(f"{label:<28}{day_rows:>8}{text_ms:>10.2f}{day_ms:>10.2f}{text_ms / day_ms:>8.1f}x")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
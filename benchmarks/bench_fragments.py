@@ -0,0 +1,63 @@
+"""Table rendering with a cold vs warm rendered-row cache.
+
+Seeds a scratch database, then times GET /, /search?format=html and the JSON
+/search in-process (Flask test client), first with the row cache emptied before
+every request and then with it warm. Both variants include the SQL query.
+
+    python benchmarks/bench_fragments.py --rows 10000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CASES = [
+    ('index page', '/'),
+    ('search, html rows', '/search?format=html&query='),
+    ('search, json', '/search?query='),
+]
+
+
+def timed(client, path, before, repeat):
+    times = []
+    for _ in range(repeat):
+        before()
+        started = time.perf_counter()
+        response = client.get(path)
+        times.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    return statistics.median(times) * 1000, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = os.path.join(scratch, 'fragments.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+        import logging
+        from load_test import seed
+        from app import app, row_cache  # creates the schema
+        logging.disable(logging.INFO)
+        seed(db_path, args.rows)
+        print(f"Seeded {args.rows} rows\n")
+
+        client = app.test_client()
+        print(f"{'case':<22}{'cold ms':>10}{'warm ms':>10}{'speedup':>9}{'KB':>8}")
+        for label, path in CASES:
+            cold, size = timed(client, path, row_cache.clear, args.repeat)
+            client.get(path)
+            warm, _ = timed(client, path, lambda: None, args.repeat)
+            print(f"{label:<22}{cold:>10.1f}{warm:>10.1f}{cold / warm:>8.1f}x{size / 1024:>8.0f}")
+        print(f"\nrow cache: {row_cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
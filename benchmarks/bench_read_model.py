@@ -0,0 +1,97 @@
+"""Compare /search, date filters and stats on the ORM path and the read model.
+
+Runs in-process against a scratch database so the numbers measure query work
+rather than HTTP. Also checks that both paths return the same rows.
+
+    python benchmarks/bench_read_model.py --rows 200000
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import sqlite3
+import tempfile
+
+SCRATCH = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(SCRATCH, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, ResumeSubmission, rate_stats, search_submissions, submission_stats  # noqa: E402
+import rates  # noqa: E402
+from epoch_days import to_epoch_day  # noqa: E402
+from read_model import ColumnarReadModel  # noqa: E402
+
+CASES = [
+    ('search "staffing"', 'staffing', {}),
+    ('search "job12345"', 'job12345', {}),
+    ('search "no match"', 'zzz-no-match', {}),
+    ('last 30 days', '', {'submission_date': (to_epoch_day('2024-12-01'), to_epoch_day('2024-12-31'))}),
+    ('interviews in Q2', '', {'interview_date': (to_epoch_day('2024-04-01'), to_epoch_day('2024-06-30'))}),
+]
+
+
+def seed(rows):
+    """Insert rows directly, filling the derived day and rate columns the model would maintain"""
+    def row(i):
+        submitted = f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}'
+        interview = f'2024-{i % 12 + 1:02d}-15' if i % 7 == 0 else None
+        rate = rates.parse_rate(f'${40 + i % 60}/hr')
+        return (f'Firm {i % 97} Staffing', f'Client {i % 31}', f'Recruiter {i % 53}', f'r{i}@example.com',
+                f'{submitted} 00:00:00.000000', f'JOB{i}',
+                ('Software Engineer', 'Data Analyst', 'DevOps Engineer')[i % 3], f'${40 + i % 60}/hr', '',
+                interview and f'{interview} 00:00:00.000000', rate.hourly_cents, rate.period, rate.currency,
+                to_epoch_day(submitted), to_epoch_day(interview))
+
+    with sqlite3.connect(db.engine.url.database) as conn:
+        conn.executemany(
+            "INSERT INTO resume_submission (recruiter_firm, client_name, recruiter_name, recruiter_contact, "
+            "submission_date, job_id, position, rate, notes, interview_date, rate_hourly_cents, rate_period, "
+            "rate_currency, submission_day, interview_day) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (row(i) for i in range(rows))
+        )
+    conn.close()
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with app.app_context():
+        seed(args.rows)
+        model = ColumnarReadModel()
+        load_ms, _ = timed(lambda: model.load(db.session.execute(db.select(ResumeSubmission.__table__)).mappings()), 1)
+        print(f"Loaded {len(model)} rows into the read model in {load_ms:.0f} ms")
+
+        print(f"\n{'case':<22}{'rows':>8}{'orm ms':>10}{'model ms':>10}{'speedup':>9}")
+        for label, query, ranges in CASES:
+            orm_ms, orm_rows = timed(lambda: search_submissions(query, ranges), args.repeat)
+            model_ms, model_rows = timed(lambda: model.search(query, ranges), args.repeat)
+            assert {row['id'] for row in orm_rows} == {row['id'] for row in model_rows}, label
+            print(f"{label:<22}{len(model_rows):>8}{orm_ms:>10.1f}{model_ms:>10.1f}{orm_ms / model_ms:>8.1f}x")
+
+        orm_ms, orm_stats = timed(submission_stats, args.repeat)
+        model_ms, model_stats = timed(model.stats, args.repeat)
+        assert orm_stats == model_stats
+        print(f"{'stats':<22}{'':>8}{orm_ms:>10.1f}{model_ms:>10.1f}{orm_ms / model_ms:>8.1f}x")
+
+        orm_ms, orm_stats = timed(rate_stats, args.repeat)
+        model_ms, model_stats = timed(model.rate_stats, args.repeat)
+        assert orm_stats == model_stats
+        print(f"{'rate stats':<22}{'':>8}{orm_ms:>10.1f}{model_ms:>10.1f}{orm_ms / model_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""Mixed read/write load test: find where one instance stops keeping up.
+
+Starts the app through run_app.py (its threaded server is the only serve mode
+there is) against a seeded scratch database and replays a weighted mix of
+page loads, searches, CSRF token fetches and add/edit/delete posts at rising
+concurrency. Each simulated user keeps its own cookie jar, fetches a CSRF
+token once and sends it as X-CSRF-Token on every post, like main.js does.
+
+Per level it prints throughput, p50/p95/p99 and error rates per route, with
+503 database_locked responses counted on their own, then the highest level
+that stayed within --max-p99-ms and --max-error-rate. Results are written to
+benchmarks/results/<version>-<timestamp>.json; --compare diffs two of them.
+
+    python benchmarks/load_test.py --rows 5000 --concurrency 1 4 16 64
+    python benchmarks/load_test.py --mix search=80,add=10,edit=10
+    python benchmarks/load_test.py --compare results/1.0.0-a.json results/1.0.0-b.json
+"""
+import os
+import sys
+import json
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.cookiejar
+import urllib.request
+from datetime import datetime
+
+import loadgen
+
+sys.path.insert(0, loadgen.ROOT)
+
+import rates  # noqa: E402
+from epoch_days import to_epoch_day  # noqa: E402
+from version import VERSION  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+DEFAULT_MIX = 'index=10,search=50,csrf=5,add=15,edit=15,delete=5'
+QUERIES = ['staffing', 'engineer', 'client 1', 'job9', 'firm:"firm 7" has:interview', 'position:analyst sort:rate']
+FIRMS = [f'Firm {i} Staffing' for i in range(97)]
+POSITIONS = ('Software Engineer', 'Data Analyst', 'DevOps Engineer')
+
+
+def parse_mix(text):
+    """'search=50,add=10' -> {'search': 50, 'add': 10}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}' (expected {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for '{name}': {weight!r}")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one positive weight")
+    return mix
+
+
+def submission_fields(i):
+    submitted = f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}'
+    return {
+        'recruiter_firm': FIRMS[i % len(FIRMS)],
+        'client_name': f'Client {i % 31}',
+        'recruiter_name': f'Recruiter {i % 53}',
+        'recruiter_contact': f'r{i}@example.com',
+        'submission_date': submitted,
+        'position': POSITIONS[i % 3],
+        'rate': f'${40 + i % 60}/hr',
+        'job_id': f'JOB{i}',
+        'interview_date': submitted if i % 5 == 0 else '',
+        'follow_up_date': '',
+        'notes': ''
+    }
+
+
+def seed(db_path, rows):
+    """Insert rows directly, filling the derived columns the model would maintain"""
+    def row(i):
+        fields = submission_fields(i)
+        rate = rates.parse_rate(fields['rate'])
+        interview = fields['interview_date'] or None
+        return (fields['recruiter_firm'], fields['client_name'], fields['recruiter_name'],
+                fields['recruiter_contact'], f"{fields['submission_date']} 00:00:00.000000",
+                interview and f'{interview} 00:00:00.000000', fields['job_id'], fields['position'],
+                fields['rate'], rate.hourly_cents, rate.period, rate.currency,
+                to_epoch_day(fields['submission_date']), to_epoch_day(interview), '')
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO resume_submission (recruiter_firm, client_name, recruiter_name, recruiter_contact, "
+            "submission_date, interview_date, job_id, position, rate, rate_hourly_cents, rate_period, "
+            "rate_currency, submission_day, interview_day, notes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (row(i) for i in range(rows))
+        )
+        ids = [id for (id,) in conn.execute("SELECT id FROM resume_submission")]
+    conn.close()
+    return ids
+
+
+class IdPool:
+    """Submission ids the workers may edit or delete, checked out one at a time
+    so two users never edit and delete the same row at once"""
+
+    def __init__(self, ids):
+        self._ids = list(ids)
+        self._lock = threading.Lock()
+
+    def checkout(self):
+        with self._lock:
+            if not self._ids:
+                return None
+            index = random.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def checkin(self, id):
+        with self._lock:
+            self._ids.append(id)
+
+
+class User:
+    """One simulated browser: a cookie jar (for the session that holds the
+    CSRF secret) and the token to echo back on posts"""
+
+    def __init__(self, base_url, pool, record):
+        self.base_url = base_url
+        self.pool = pool
+        self.record = record
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.token = None
+        self.counter = random.randrange(1_000_000)
+
+    def call(self, route, method, path, data=None, headers=None):
+        status, body, seconds = loadgen.request(self.opener, method, self.base_url + path, data, headers)
+        self.record(route, status, seconds, body)
+        return status, body
+
+    def csrf(self):
+        status, body = self.call('/get_csrf_token', 'GET', '/get_csrf_token')
+        if status == 200:
+            self.token = json.loads(body)['csrf_token']
+
+    def post(self, route, path, data):
+        if self.token is None:
+            self.csrf()
+        return self.call(route, 'POST', path, data, {'X-CSRF-Token': self.token or ''})
+
+    def index(self):
+        self.call('/', 'GET', '/')
+
+    def search(self):
+        query = urllib.request.quote(random.choice(QUERIES))
+        self.call('/search', 'GET', f'/search?query={query}')
+
+    def add(self):
+        self.counter += 1
+        status, body = self.post('/add', '/add', submission_fields(self.counter))
+        if status == 200:
+            self.pool.checkin(json.loads(body)['data']['id'])
+
+    def edit(self):
+        id = self.pool.checkout()
+        if id is None:
+            return self.add()
+        self.counter += 1
+        try:
+            self.post('/edit', f'/edit/{id}', submission_fields(self.counter))
+        finally:
+            self.pool.checkin(id)
+
+    def delete(self):
+        id = self.pool.checkout()
+        if id is None:
+            return self.add()
+        self.post('/delete', f'/delete/{id}', {})
+
+
+OPERATIONS = {
+    'index': User.index,
+    'search': User.search,
+    'csrf': User.csrf,
+    'add': User.add,
+    'edit': User.edit,
+    'delete': User.delete
+}
+
+
+def mixed_worker(base_url, pool, mix):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    def worker(stop, record):
+        user = User(base_url, pool, record)
+        while not stop.is_set():
+            OPERATIONS[random.choices(names, weights)[0]](user)
+    return worker
+
+
+def capacity(levels, max_p99_ms, max_error_rate):
+    """Highest concurrency whose overall p99 and error rate stayed within limits"""
+    best = None
+    for level in levels:
+        overall = level['routes']['ALL']
+        if overall['p99_ms'] > max_p99_ms or overall['error_rate'] > max_error_rate:
+            break
+        best = level['concurrency']
+    return best
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=loadgen.ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{results['version']}-{results['started']}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def compare(before_path, after_path):
+    """Print per-level, per-route throughput and p99 changes between two result files"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before['version']} ({before.get('commit')}, {before['started']}) -> "
+          f"{after['version']} ({after.get('commit')}, {after['started']})")
+    print(f"capacity: {before['capacity']} -> {after['capacity']} concurrent users")
+    old_levels = {level['concurrency']: level['routes'] for level in before['levels']}
+    for level in after['levels']:
+        old_routes = old_levels.get(level['concurrency'])
+        if old_routes is None:
+            continue
+        print(f"\nconcurrency {level['concurrency']}")
+        print(f"{'route':<18}{'rps':>18}{'p99 ms':>20}{'err%':>16}")
+        for route, new in level['routes'].items():
+            old = old_routes.get(route)
+            if old is None:
+                continue
+            print(f"{route:<18}{old['throughput_rps']:>8} -> {new['throughput_rps']:<7}"
+                  f"{old['p99_ms']:>9} -> {new['p99_ms']:<8}"
+                  f"{old['error_rate'] * 100:>6.2f} -> {new['error_rate'] * 100:<6.2f}")
+
+
+def parse_env(values):
+    env = {}
+    for value in values:
+        name, sep, setting = value.partition('=')
+        if not sep:
+            raise SystemExit(f"--env expects NAME=VALUE, got {value!r}")
+        env[name] = setting
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help="rows to seed before the run")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help="extra environment for the server, e.g. RESUME_TRACKER_READ_MODEL=1")
+    parser.add_argument('--max-p99-ms', type=float, default=1000.0)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="diff two saved result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    env = parse_env(args.env)
+    results = {
+        'version': VERSION,
+        'commit': git_commit(),
+        'started': datetime.now().strftime('%Y%m%dT%H%M%S'),
+        'rows': args.rows,
+        'duration': args.duration,
+        'mix': args.mix,
+        'env': env,
+        'levels': []
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = os.path.join(scratch, 'load.db')
+        # First start creates the schema; seed it before measuring anything
+        process, _ = loadgen.start_server(db_path, env=env)
+        loadgen.stop_server(process)
+        pool = IdPool(seed(db_path, args.rows))
+        print(f"Seeded {args.rows} rows")
+
+        process, base_url = loadgen.start_server(db_path, env=env)
+        try:
+            for concurrency in args.concurrency:
+                samples, elapsed = loadgen.run_load(mixed_worker(base_url, pool, args.mix), concurrency, args.duration)
+                summary = loadgen.summarize(samples, elapsed)
+                loadgen.print_summary(f"concurrency {concurrency}", summary)
+                results['levels'].append({'concurrency': concurrency, 'elapsed': round(elapsed, 2),
+                                          'routes': summary})
+        finally:
+            loadgen.stop_server(process)
+
+    results['capacity'] = capacity(results['levels'], args.max_p99_ms, args.max_error_rate)
+    print(f"\nHighest concurrency within p99 <= {args.max_p99_ms:g} ms and errors <= "
+          f"{args.max_error_rate:.1%}: {results['capacity']}")
+    print(f"Results saved to {save_results(results, args.output_dir)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Offline HTTP load generator shared by the benchmark scripts.
+
+Everything here uses the standard library only: the app under test is started
+as a subprocess through run_app.py and driven over loopback.
+"""
+import os
+import sys
+import time
+import json
+import socket
+import subprocess
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path, env=None, port=None, timeout=30, args=()):
+    """Start run_app.py (with extra `args`) against db_path and wait until it answers"""
+    port = port or free_port()
+    server_env = dict(os.environ, DATABASE_URL=f'sqlite:///{os.path.abspath(db_path)}')
+    server_env.update(env or {})
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'run_app.py'), '--no-browser', '--port', str(port), *args],
+        cwd=ROOT,
+        env=server_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(base_url + '/get_csrf_token', timeout=1).read()
+            return process, base_url
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def request(opener, method, url, data=None, headers=None, timeout=30):
+    """Issue one request and return (status, body, seconds); errors become status 0"""
+    body = None
+    if data is not None:
+        body = urllib.parse.urlencode(data).encode()
+    req = urllib.request.Request(url, data=body, method=method, headers=headers or {})
+    started = time.perf_counter()
+    try:
+        with opener.open(req, timeout=timeout) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout) as e:
+        payload = str(e).encode()
+        status = 0
+    return status, payload, time.perf_counter() - started
+
+
+def run_load(worker, concurrency, duration):
+    """Run `worker(stop_event, record)` on `concurrency` threads for `duration` seconds.
+
+    Workers call record(route, status, seconds, body) once per request. Returns
+    the list of samples and the wall-clock time actually spent.
+    """
+    samples = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def record(route, status, seconds, body=b''):
+        with lock:
+            samples.append((route, status, seconds, body))
+
+    threads = [threading.Thread(target=worker, args=(stop, record), daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def is_error(status):
+    return status == 0 or status >= 400
+
+
+def is_database_locked(status, body):
+    """The app's 503 for a request that could not get SQLite's write lock"""
+    if status != 503:
+        return False
+    try:
+        return json.loads(body).get('error') == 'database_locked'
+    except (ValueError, AttributeError):
+        return False
+
+
+def summarize(samples, elapsed):
+    """Per-route throughput, latency percentiles (ms) and error rates"""
+    by_route = defaultdict(list)
+    for sample in samples:
+        by_route[sample[0]].append(sample)
+    by_route['ALL'] = list(samples)
+
+    summary = {}
+    for route, route_samples in sorted(by_route.items()):
+        latencies = sorted(sample[2] * 1000 for sample in route_samples)
+        statuses = defaultdict(int)
+        for sample in route_samples:
+            statuses[str(sample[1])] += 1
+        errors = sum(1 for sample in route_samples if is_error(sample[1]))
+        locked = sum(1 for sample in route_samples if is_database_locked(sample[1], sample[3]))
+        summary[route] = {
+            'requests': len(route_samples),
+            'throughput_rps': round(len(route_samples) / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'error_rate': round(errors / len(route_samples), 4) if route_samples else 0.0,
+            'database_locked': locked,
+            'statuses': dict(statuses)
+        }
+    return summary
+
+
+def print_summary(title, summary):
+    print(f"\n{title}")
+    print(f"{'route':<18}{'reqs':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>8}{'locked':>8}")
+    for route, row in summary.items():
+        print(f"{route:<18}{row['requests']:>8}{row['throughput_rps']:>9}{row['p50_ms']:>9}"
+              f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['error_rate'] * 100:>8.2f}{row['database_locked']:>8}")
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
@@ -0,0 +1,84 @@
+import re
+from collections import namedtuple
+from markupsafe import Markup, escape
+
+# Country code assumed for 10-digit numbers written without one
+DEFAULT_COUNTRY_CODE = '1'
+
+ContactPoint = namedtuple('ContactPoint', 'kind value')
+
+# The patterns main.js used to apply to every row on every refresh
+_CONTACT_RE = re.compile(
+    r'(?P<email>[a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9._-]+)'
+    r'|(?P<url>https?://\S+|www\.\S+)'
+    r'|(?P<phone>(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4})'
+)
+_TRAILING = '.,;:!?)]\'"'
+
+
+def normalize_email(text):
+    return text.strip().rstrip('.').lower()
+
+
+def normalize_phone(text, country_code=DEFAULT_COUNTRY_CODE):
+    """E.164 form (+15551234567) of a written phone number, or None if it cannot be one"""
+    digits = re.sub(r'\D', '', text)
+    if text.strip().startswith('+'):
+        number = digits
+    elif len(digits) == 10:
+        number = country_code + digits
+    elif len(digits) == 11 and digits.startswith(country_code):
+        number = digits
+    else:
+        return None
+    return f'+{number}' if 8 <= len(number) <= 15 else None
+
+
+def normalize_url(text):
+    url = text.strip().rstrip(_TRAILING)
+    if not re.match(r'https?://', url, re.IGNORECASE):
+        url = f'http://{url}'
+    scheme, _, rest = url.partition('://')
+    host, slash, path = rest.partition('/')
+    return f'{scheme.lower()}://{host.lower()}{slash}{path}'
+
+
+def _normalized(match):
+    """(kind, normalized value) for one regex match; value is None if it does not normalize"""
+    value = match.group(0)
+    if match.group('email'):
+        return 'email', normalize_email(value)
+    if match.group('url'):
+        return 'url', normalize_url(value)
+    return 'phone', normalize_phone(value)
+
+
+def parse_contacts(text):
+    """Emails, E.164 phone numbers and URLs found in free-text contact info, in order, without repeats"""
+    points = []
+    for match in _CONTACT_RE.finditer(text or ''):
+        point = ContactPoint(*_normalized(match))
+        if point.value and point not in points:
+            points.append(point)
+    return points
+
+
+def link_contacts(text):
+    """Escape free-text contact info and turn emails, URLs and phone numbers into links"""
+    if not text:
+        return Markup('')
+    parts = []
+    position = 0
+    for match in _CONTACT_RE.finditer(text):
+        kind, value = _normalized(match)
+        parts.append(escape(text[position:match.start()]))
+        if kind == 'email':
+            parts.append(Markup('<a href="mailto:{}">{}</a>').format(value, match.group(0)))
+        elif kind == 'url':
+            parts.append(Markup('<a href="{}" target="_blank">{}</a>').format(value, match.group(0)))
+        else:
+            href = value or re.sub(r'[^\d+]', '', match.group(0))
+            parts.append(Markup('<a href="tel:{}">{}</a>').format(href, match.group(0)))
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return Markup('').join(parts)
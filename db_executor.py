@@ -0,0 +1,85 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class BoundedExecutor:
+    """Thread pool for SQLite work with a hard cap on queued jobs.
+
+    At most `max_workers` jobs touch the database at once and at most
+    `max_queue` more wait for a worker; anything beyond that is rejected
+    straight away so callers can answer 503 instead of piling up.
+    """
+
+    def __init__(self, max_workers=4, max_queue=64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-executor')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"DB executor saturated: {self.max_workers} active, {self.max_queue} queued")
+            raise ExecutorSaturated()
+
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_seconds += started - enqueued
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._run_seconds += time.perf_counter() - started
+                self._slots.release()
+
+        return self._pool.submit(job)
+
+    def stats(self):
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'queued': self._queued,
+                'peak_queued': self._peak_queued,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'saturation': round((self._active + self._queued) / (self.max_workers + self.max_queue), 3),
+                'avg_wait_ms': round(self._wait_seconds / completed * 1000, 3),
+                'avg_run_ms': round(self._run_seconds / completed * 1000, 3)
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
@@ -0,0 +1,29 @@
+from datetime import date, datetime, timedelta
+
+EPOCH = date(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def to_epoch_day(value):
+    """Days since 1970-01-01 for a date, datetime or 'YYYY-MM-DD...' string; None stays None"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], '%Y-%m-%d')
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def from_epoch_day(day):
+    """The date `day` days after 1970-01-01; None stays None"""
+    if day is None:
+        return None
+    return EPOCH + timedelta(days=int(day))
+
+
+def format_epoch_day(day):
+    """'YYYY-MM-DD' for an epoch day, matching ResumeSubmission.to_dict()"""
+    if day is None:
+        return None
+    return from_epoch_day(day).strftime('%Y-%m-%d')
@@ -0,0 +1,102 @@
+import time
+import threading
+from collections import OrderedDict
+from markupsafe import Markup
+
+
+class Fragment:
+    """One cached row: `data` is its to_dict() (served as JSON) and `html` its
+    table cells, rendered the first time an HTML listing asks for them"""
+
+    __slots__ = ('version', 'data', '_html', '_cache')
+
+    def __init__(self, version, data, cache):
+        self.version = version
+        self.data = data
+        self._html = None
+        self._cache = cache
+
+    @property
+    def html(self):
+        if self._html is None:
+            self._html = self._cache._render(self.data)
+        return self._html
+
+
+class FragmentCache:
+    """Rendered table rows, keyed by (scope, id) and valid for one row_version.
+
+    `render(data)` produces the HTML for every cell except the row number, which
+    depends on where the row lands in a listing and is added by assemble_rows().
+    A lookup with a different row_version misses, so an edit committed by any
+    process is picked up; the mutation routes also invalidate their row so the
+    stale entry does not sit in the LRU.
+    """
+
+    def __init__(self, render, max_rows=20000):
+        self.render = render
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._render_seconds = 0.0
+
+    def get(self, key, version):
+        with self._lock:
+            fragment = self._rows.get(key)
+            if fragment is None or fragment.version != version:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def _render(self, data):
+        started = time.perf_counter()
+        html = Markup(self.render(data))
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._render_seconds += elapsed
+        return html
+
+    def put(self, key, data):
+        """Cache `data` under its own row_version"""
+        fragment = Fragment(data['row_version'], data, self)
+        with self._lock:
+            self._rows[key] = fragment
+            self._rows.move_to_end(key)
+            if len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+        return fragment
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._rows.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'rows': len(self._rows),
+                'max_rows': self.max_rows,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'render_ms_total': round(self._render_seconds * 1000, 2)
+            }
+
+
+def assemble_rows(fragments):
+    """Join cached cells into <tr>s, numbering them in listing order"""
+    return Markup(''.join(
+        f'<tr data-id="{fragment.data["id"]}"><td>{number}</td>{fragment.html}</tr>\n'
+        for number, fragment in enumerate(fragments, 1)
+    ))
@@ -0,0 +1,197 @@
+import re
+import time
+import threading
+from collections import OrderedDict, namedtuple
+
+# Filter keys usable as key:value, mapped to ResumeSubmission columns
+MATCH_FIELDS = {
+    'firm': 'recruiter_firm',
+    'client': 'client_name',
+    'recruiter': 'recruiter_name',
+    'contact': 'recruiter_contact',
+    'job': 'job_id',
+    'position': 'position',
+    'rate': 'rate',
+    'notes': 'notes'
+}
+HAS_FIELDS = {
+    'interview': 'interview_date',
+    'follow_up': 'follow_up_date',
+    'rate': 'rate',
+    'notes': 'notes'
+}
+SORT_FIELDS = {
+    'submitted': 'submission_date',
+    'interview': 'interview_date',
+    'follow_up': 'follow_up_date',
+    'firm': 'recruiter_firm',
+    'client': 'client_name',
+    'position': 'position',
+    'rate': 'rate_hourly_cents'
+}
+
+_TOKEN_RE = re.compile(
+    r'(?P<neg>-)?(?P<key>[a-z_]+):(?:"(?P<quoted>[^"]*)"|(?P<value>[^\s"]+))'
+    r'|"(?P<phrase>[^"]*)"'
+    r'|(?P<word>\S+)'
+)
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+# kind is 'match' (column contains a value) or 'has' (column is set)
+Term = namedtuple('Term', 'kind column negated')
+
+
+class ParsedQuery(namedtuple('ParsedQuery', 'text terms values sort')):
+    """A parsed filter expression.
+
+    `text` is matched against every search column like a plain query, `terms`
+    and `sort` make up the query's shape, and `values` holds the literal for
+    each match term in order. Two queries with the same shape can share one
+    compiled statement and differ only in bound parameters.
+    """
+
+    @property
+    def shape(self):
+        return bool(self.text), self.terms, self.sort
+
+    def params(self):
+        """Bound parameter values for the statement built from this shape"""
+        params = {f'v{i}': f'%{value}%' for i, value in enumerate(self.values)}
+        if self.text:
+            params['text'] = f'%{self.text}%'
+        return params
+
+    def filters(self):
+        """(term, value) pairs, value being None for 'has' terms"""
+        values = iter(self.values)
+        return [(term, next(values) if term.kind == 'match' else None) for term in self.terms]
+
+
+def parse(query):
+    """Parse `firm:"Tech Staffing" position:engineer has:interview sort:follow_up`.
+
+    key:value terms match one column (substring, case-insensitive) and may be
+    negated with a leading '-'; has:<field> requires a value to be set and
+    sort:<field> / sort:-<field> orders ascending / descending. Anything else
+    is free text matched against every column, so a query with no keys or
+    quotes behaves exactly like the original single-string search.
+    """
+    query = query.strip().lower()
+    if ':' not in query and '"' not in query:
+        return ParsedQuery(query, (), (), None)
+
+    words, terms, values, sort = [], [], [], None
+    for match in _TOKEN_RE.finditer(query):
+        key = match.group('key')
+        value = match.group('quoted') if match.group('quoted') is not None else match.group('value')
+        negated = bool(match.group('neg'))
+        if key == 'has':
+            if value not in HAS_FIELDS:
+                raise QuerySyntaxError(f"Unknown has: field '{value}' (expected one of {', '.join(HAS_FIELDS)})")
+            terms.append(Term('has', HAS_FIELDS[value], negated))
+        elif key == 'sort':
+            descending = value.startswith('-')
+            field = value.lstrip('-')
+            if field not in SORT_FIELDS:
+                raise QuerySyntaxError(f"Unknown sort field '{field}' (expected one of {', '.join(SORT_FIELDS)})")
+            sort = (SORT_FIELDS[field], descending)
+        elif key in MATCH_FIELDS:
+            terms.append(Term('match', MATCH_FIELDS[key], negated))
+            values.append(value.strip())
+        elif match.group('phrase') is not None:
+            words.append(match.group('phrase'))
+        else:
+            # Unknown keys ("http://...") are just text
+            words.append(match.group(0))
+    return ParsedQuery(' '.join(word for word in words if word), tuple(terms), tuple(values), sort)
+
+
+class QueryCache:
+    """LRU caches of parsed queries and of statements built per query shape.
+
+    Reusing the statement object also reuses SQLAlchemy's memoized cache key,
+    so a repeated shape skips parsing, expression building and cache-key
+    generation; only the bound values change. Timings of cached and uncached
+    preparations are kept so /stats/query_cache can report what that saves.
+    """
+
+    def __init__(self, max_queries=512, max_statements=128):
+        self.max_queries = max_queries
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._parsed = OrderedDict()
+        self._statements = OrderedDict()
+        self.parse_hits = 0
+        self.parse_misses = 0
+        self.statement_hits = 0
+        self.statement_misses = 0
+        self._hit_seconds = 0.0
+        self._miss_seconds = 0.0
+
+    @staticmethod
+    def _lookup(cache, key, limit, make):
+        """Return (value, hit); caller holds the lock"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            return value, True
+        value = make()
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+        return value, False
+
+    def parse(self, query):
+        with self._lock:
+            parsed, hit = self._lookup(self._parsed, query, self.max_queries, lambda: parse(query))
+            if hit:
+                self.parse_hits += 1
+            else:
+                self.parse_misses += 1
+            return parsed
+
+    def prepare(self, query, range_shape, build):
+        """Parsed query plus the statement for its shape, built by build(parsed, range_shape) on a miss"""
+        start = time.perf_counter()
+        parsed = self.parse(query)
+        key = (parsed.shape, range_shape)
+        with self._lock:
+            statement, hit = self._lookup(self._statements, key, self.max_statements,
+                                          lambda: build(parsed, range_shape))
+            elapsed = time.perf_counter() - start
+            if hit:
+                self.statement_hits += 1
+                self._hit_seconds += elapsed
+            else:
+                self.statement_misses += 1
+                self._miss_seconds += elapsed
+        return parsed, statement
+
+    def clear(self):
+        with self._lock:
+            self._parsed.clear()
+            self._statements.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.statement_hits + self.statement_misses
+            avg_hit = self._hit_seconds / self.statement_hits if self.statement_hits else None
+            avg_miss = self._miss_seconds / self.statement_misses if self.statement_misses else None
+            saved = avg_miss - avg_hit if avg_hit is not None and avg_miss is not None else None
+            return {
+                'parsed_queries': len(self._parsed),
+                'statements': len(self._statements),
+                'parse_hits': self.parse_hits,
+                'parse_misses': self.parse_misses,
+                'statement_hits': self.statement_hits,
+                'statement_misses': self.statement_misses,
+                'hit_rate': round(self.statement_hits / lookups, 3) if lookups else None,
+                'avg_hit_ms': round(avg_hit * 1000, 4) if avg_hit is not None else None,
+                'avg_miss_ms': round(avg_miss * 1000, 4) if avg_miss is not None else None,
+                'saved_ms_per_hit': round(saved * 1000, 4) if saved is not None else None,
+                'saved_ms_total': round(saved * self.statement_hits * 1000, 2) if saved is not None else None
+            }
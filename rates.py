@@ -0,0 +1,166 @@
+import re
+from collections import namedtuple
+
+HOURS_PER_PERIOD = {
+    'hour': 1,
+    'day': 8,
+    'week': 40,
+    'month': 2080 / 12,
+    'year': 2080
+}
+
+PERIOD_WORDS = {
+    'h': 'hour', 'hr': 'hour', 'hrs': 'hour', 'hour': 'hour', 'hourly': 'hour', 'ph': 'hour',
+    'd': 'day', 'day': 'day', 'daily': 'day',
+    'w': 'week', 'wk': 'week', 'week': 'week', 'weekly': 'week',
+    'm': 'month', 'mo': 'month', 'mon': 'month', 'month': 'month', 'monthly': 'month',
+    'y': 'year', 'yr': 'year', 'year': 'year', 'yearly': 'year', 'annual': 'year',
+    'annually': 'year', 'pa': 'year', 'salary': 'year'
+}
+
+CURRENCY_SYMBOLS = {'$': 'USD', '£': 'GBP', '€': 'EUR', '₹': 'INR'}
+CURRENCY_CODES = ('USD', 'CAD', 'GBP', 'EUR', 'AUD', 'INR')
+# Assumed when a rate names no currency, and the one rate filters/stats use by default
+DEFAULT_CURRENCY = 'USD'
+
+# Largest value rate_hourly_cents can hold (SQLite INTEGER is 64-bit)
+MAX_HOURLY_CENTS = 2 ** 63 - 1
+
+# Histogram buckets for rate stats, in dollars per hour
+HISTOGRAM_WIDTH = 10
+HISTOGRAM_BUCKETS = 20
+
+Rate = namedtuple('Rate', 'hourly_cents period currency')
+NO_RATE = Rate(None, None, None)
+
+_AMOUNT = r'(?<![\d.,])(\d+(?:[.,]\d+)*)\s*(k)?'
+_AMOUNT_RE = re.compile(_AMOUNT + r'(?:\s*(?:-|–|to)\s*[$£€₹]?\s*' + _AMOUNT + r')?', re.IGNORECASE)
+_WORD_RE = re.compile(r'[a-z]+(?![a-z0-9])')
+# Tax/engagement terms whose digits are not amounts ("C2C", "W2", "1099")
+_TERMS_RE = re.compile(r'\b(?:c2c|w-?2|1099)\b', re.IGNORECASE)
+_CURRENCY_CODE_RE = re.compile(r'\b(' + '|'.join(CURRENCY_CODES) + r')\b', re.IGNORECASE)
+_BEFORE_RE = re.compile(r'(?:[$£€₹]|\b(?:' + '|'.join(CURRENCY_CODES) + r'))\s*$', re.IGNORECASE)
+_AFTER_RE = re.compile(r'\s*(?:/|per\b|an?\b)?\s*([a-z]+)', re.IGNORECASE)
+
+
+def _number(digits, thousands):
+    """The value of a matched amount, or None when it is not one number ("5.5.2025", "v2.1.0").
+
+    Commas are thousands separators; several dots are too, but only in
+    three-digit groups ("1.000.000").
+    """
+    digits = digits.replace(',', '')
+    if digits.count('.') > 1:
+        head, *groups = digits.split('.')
+        if any(len(group) != 3 for group in groups):
+            return None
+        digits = head + ''.join(groups)
+    value = float(digits)
+    return value * 1000 if thousands else value
+
+
+def _amount(match):
+    """Midpoint of a matched amount or range, or None if either end is not a number"""
+    thousands = match.group(2) or match.group(4)
+    low = _number(match.group(1), thousands)
+    high = _number(match.group(3), thousands) if match.group(3) else low
+    if low is None or high is None:
+        return None
+    return (low + high) / 2
+
+
+def _is_marked(text, match):
+    """Whether an amount sits next to a currency or a period word ("$65", "65/hr")"""
+    if match.group(2) or match.group(4) or _BEFORE_RE.search(text[:match.start()]):
+        return True
+    after = _AFTER_RE.match(text, match.end())
+    return bool(after) and after.group(1).lower() in PERIOD_WORDS
+
+
+def parse_rate(text):
+    """Normalize a free-text rate ("$50/hr", "120k", "65 C2C") to hourly cents.
+
+    Ranges use their midpoint, and a "k" on either end applies to both. When
+    several numbers appear, the one next to a currency or period is used;
+    digits in C2C/W2/1099 are never amounts. Without an explicit period,
+    amounts under 1000 are taken as hourly and anything larger (or written
+    with "k") as yearly. Returns NO_RATE when no amount can be found; it
+    never raises, since it runs on every write of free text.
+    """
+    if not text:
+        return NO_RATE
+    # Blank out the terms, keeping offsets, so their digits cannot be read as amounts
+    masked = _TERMS_RE.sub(lambda term: ' ' * len(term.group(0)), text)
+    candidates = [match for match in _AMOUNT_RE.finditer(masked) if _amount(match) is not None]
+    if not candidates:
+        return NO_RATE
+    match = next((candidate for candidate in candidates if _is_marked(masked, candidate)), candidates[0])
+    amount = _amount(match)
+    thousands = match.group(2) or match.group(4)
+
+    lowered = masked.lower()
+    period = None
+    for word in _WORD_RE.findall(lowered[match.end():]) + _WORD_RE.findall(lowered[:match.start()]):
+        if word in PERIOD_WORDS:
+            period = PERIOD_WORDS[word]
+            break
+    if period is None:
+        period = 'year' if thousands or amount >= 1000 else 'hour'
+
+    code = _CURRENCY_CODE_RE.search(text)
+    if code:
+        currency = code.group(1).upper()
+    else:
+        currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), DEFAULT_CURRENCY)
+
+    cents = amount * 100 / HOURS_PER_PERIOD[period]
+    if not cents <= MAX_HOURLY_CENTS:  # also catches inf from a few hundred digits
+        return NO_RATE
+    return Rate(int(round(cents)), period, currency)
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an ascending list (same method as numpy's default)"""
+    if len(sorted_values) == 0:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def histogram_bucket(cents):
+    return min(int(cents // (HISTOGRAM_WIDTH * 100)), HISTOGRAM_BUCKETS - 1)
+
+
+def summarize(sorted_cents, bucket_counts=None):
+    """Percentiles and a histogram, in dollars per hour, for ascending hourly cents.
+
+    Works on a list or a numpy array; pass bucket_counts when the caller has
+    already counted buckets (the read model does it with one bincount).
+    """
+    if len(sorted_cents) == 0:
+        return {'count': 0}
+    if bucket_counts is None:
+        bucket_counts = [0] * HISTOGRAM_BUCKETS
+        for cents in sorted_cents:
+            bucket_counts[histogram_bucket(cents)] += 1
+
+    def dollars(cents):
+        return round(float(cents) / 100, 2)
+
+    return {
+        'count': len(sorted_cents),
+        'min': dollars(sorted_cents[0]),
+        'p25': dollars(percentile(sorted_cents, 25)),
+        'median': dollars(percentile(sorted_cents, 50)),
+        'p75': dollars(percentile(sorted_cents, 75)),
+        'p90': dollars(percentile(sorted_cents, 90)),
+        'max': dollars(sorted_cents[-1]),
+        'histogram': [
+            {'from': bucket * HISTOGRAM_WIDTH,
+             'to': None if bucket == HISTOGRAM_BUCKETS - 1 else (bucket + 1) * HISTOGRAM_WIDTH,
+             'count': int(count)}
+            for bucket, count in enumerate(bucket_counts) if count
+        ]
+    }
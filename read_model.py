@@ -0,0 +1,384 @@
+import sys
+import logging
+import threading
+
+import rates
+import contacts
+from epoch_days import format_epoch_day, to_epoch_day
+
+try:
+    import numpy as np
+except ImportError:  # optional: the read model is simply unavailable without it
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NULL_CODE = -1
+NULL_DAY = -2 ** 31
+NULL_RATE = -1
+NULL_CURRENCY = -1
+
+# Column order matches ResumeSubmission.to_dict()
+FIELDS = (
+    'id', 'recruiter_firm', 'client_name', 'recruiter_name', 'recruiter_contact',
+    'submission_date', 'position', 'rate', 'job_id', 'notes', 'interview_date', 'follow_up_date',
+    'row_version'
+)
+STRING_COLUMNS = (
+    'recruiter_firm', 'client_name', 'recruiter_name', 'recruiter_contact',
+    'position', 'rate', 'job_id', 'notes'
+)
+DATE_COLUMNS = ('submission_date', 'interview_date', 'follow_up_date')
+# The columns /search matches against, same as the SQL path
+SEARCH_COLUMNS = (
+    'recruiter_firm', 'client_name', 'recruiter_name', 'recruiter_contact',
+    'job_id', 'position', 'rate'
+)
+
+
+def available():
+    return np is not None
+
+
+class _Dictionary:
+    """Interned distinct values of one string column; rows store int32 codes into it"""
+
+    def __init__(self):
+        self.values = []
+        self.lowered = []
+        self.codes = {}
+
+    def intern(self, value):
+        if value is None:
+            return NULL_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.lowered.append(value.lower())
+            self.codes[value] = code
+        return code
+
+    def value(self, code):
+        return None if code == NULL_CODE else self.values[code]
+
+    def matching(self, needle):
+        """Boolean mask over the dictionary: which distinct values contain needle"""
+        return np.fromiter((needle in value for value in self.lowered), dtype=bool, count=len(self.lowered))
+
+    def ranks(self):
+        """Position of each code in sorted value order (SQLite's BINARY collation)"""
+        ranks = np.empty(len(self.values), dtype=np.int64)
+        ranks[sorted(range(len(self.values)), key=self.values.__getitem__)] = np.arange(len(self.values))
+        return ranks
+
+
+class ColumnarReadModel:
+    """In-memory, column-oriented copy of resume_submission for read-only queries.
+
+    Strings are dictionary-encoded (each distinct value is stored once and rows
+    hold int32 codes) and dates are int32 epoch days, so a few hundred thousand
+    rows take a few MB. Searches match the needle against each column's distinct
+    values once, then turn that into a row mask with a single numpy gather;
+    date filters and aggregates are plain array comparisons and bincounts.
+
+    The model is kept current by the mutation routes calling upsert()/delete()
+    after they commit. It only sees writes made through this process.
+    """
+
+    def __init__(self, initial_capacity=1024):
+        if np is None:
+            raise RuntimeError("The columnar read model needs numpy")
+        self._lock = threading.RLock()
+        self._initial_capacity = initial_capacity
+        self.loaded = False
+        self._reset()
+
+    def _reset(self):
+        capacity = self._initial_capacity
+        self._size = 0
+        self._row_of = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._codes = {column: np.full(capacity, NULL_CODE, dtype=np.int32) for column in STRING_COLUMNS}
+        self._days = {column: np.full(capacity, NULL_DAY, dtype=np.int32) for column in DATE_COLUMNS}
+        self._rate_cents = np.full(capacity, NULL_RATE, dtype=np.int64)
+        # Index into rates.CURRENCY_CODES
+        self._currencies = np.full(capacity, NULL_CURRENCY, dtype=np.int8)
+        self._versions = np.ones(capacity, dtype=np.int64)
+        self._dictionaries = {column: _Dictionary() for column in STRING_COLUMNS}
+        self._parsed_contacts = {}
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        self._ids = np.resize(self._ids, capacity)
+        for column, codes in self._codes.items():
+            grown = np.full(capacity, NULL_CODE, dtype=np.int32)
+            grown[:len(codes)] = codes
+            self._codes[column] = grown
+        for column, days in self._days.items():
+            grown = np.full(capacity, NULL_DAY, dtype=np.int32)
+            grown[:len(days)] = days
+            self._days[column] = grown
+        grown = np.full(capacity, NULL_RATE, dtype=np.int64)
+        grown[:len(self._rate_cents)] = self._rate_cents
+        self._rate_cents = grown
+        grown = np.full(capacity, NULL_CURRENCY, dtype=np.int8)
+        grown[:len(self._currencies)] = self._currencies
+        self._currencies = grown
+        self._versions = np.resize(self._versions, capacity)
+
+    def _write(self, row, record):
+        self._ids[row] = record['id']
+        for column in STRING_COLUMNS:
+            self._codes[column][row] = self._dictionaries[column].intern(record.get(column))
+        for column in DATE_COLUMNS:
+            day = to_epoch_day(record.get(column))
+            self._days[column][row] = NULL_DAY if day is None else day
+        rate = rates.parse_rate(record.get('rate'))
+        if rate.hourly_cents is None:
+            self._rate_cents[row], self._currencies[row] = NULL_RATE, NULL_CURRENCY
+        else:
+            self._rate_cents[row] = rate.hourly_cents
+            self._currencies[row] = rates.CURRENCY_CODES.index(rate.currency)
+        self._versions[row] = record.get('row_version') or 1
+
+    def load(self, records):
+        """Replace the contents with `records` (mappings with to_dict()-style keys)"""
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._append(record)
+            self.loaded = True
+            logger.info(f"Read model loaded {self._size} rows")
+
+    def _append(self, record):
+        if self._size == len(self._ids):
+            self._grow()
+        row = self._size
+        self._write(row, record)
+        self._row_of[int(record['id'])] = row
+        self._size += 1
+
+    def upsert(self, record):
+        with self._lock:
+            row = self._row_of.get(int(record['id']))
+            if row is None:
+                self._append(record)
+            else:
+                self._write(row, record)
+
+    def delete(self, id):
+        """Drop a row by moving the last row into its slot"""
+        with self._lock:
+            row = self._row_of.pop(int(id), None)
+            if row is None:
+                return
+            last = self._size - 1
+            if row != last:
+                self._ids[row] = self._ids[last]
+                for codes in self._codes.values():
+                    codes[row] = codes[last]
+                for days in self._days.values():
+                    days[row] = days[last]
+                self._rate_cents[row] = self._rate_cents[last]
+                self._currencies[row] = self._currencies[last]
+                self._versions[row] = self._versions[last]
+                self._row_of[int(self._ids[row])] = row
+            self._size = last
+
+    def _record(self, row):
+        record = {'id': int(self._ids[row]), 'row_version': int(self._versions[row])}
+        for column in STRING_COLUMNS:
+            record[column] = self._dictionaries[column].value(int(self._codes[column][row]))
+        for column in DATE_COLUMNS:
+            day = int(self._days[column][row])
+            record[column] = None if day == NULL_DAY else format_epoch_day(day)
+        result = {field: record[field] for field in FIELDS}
+        result['contacts'] = self._contacts(int(self._codes['recruiter_contact'][row]))
+        return result
+
+    def _contacts(self, code):
+        """Parsed contact points for a recruiter_contact code, worked out once per distinct value"""
+        points = self._parsed_contacts.get(code)
+        if points is None:
+            text = self._dictionaries['recruiter_contact'].value(code)
+            points = [{'kind': kind, 'value': value} for kind, value in contacts.parse_contacts(text)]
+            self._parsed_contacts[code] = points
+        return points
+
+    def _contains(self, column, needle):
+        codes = self._codes[column][:self._size]
+        hits = self._dictionaries[column].matching(needle)
+        if not hits.any():
+            return np.zeros(self._size, dtype=bool)
+        # NULL_CODE (-1) would index the last entry, so clear those rows afterwards
+        return hits[codes] & (codes != NULL_CODE)
+
+    def _is_set(self, column):
+        if column in self._days:
+            return self._days[column][:self._size] != NULL_DAY
+        codes = self._codes[column][:self._size]
+        is_set = codes != NULL_CODE
+        # Blank text fields are stored as '' and count as unset, as in SQL
+        empty = self._dictionaries[column].codes.get('')
+        if empty is not None:
+            is_set &= codes != empty
+        return is_set
+
+    def _mask(self, query, date_ranges, rate_range=None, filters=()):
+        size = self._size
+        if query:
+            mask = np.zeros(size, dtype=bool)
+            for column in SEARCH_COLUMNS:
+                mask |= self._contains(column, query)
+        else:
+            mask = np.ones(size, dtype=bool)
+
+        for term, value in filters:
+            if term.kind == 'has':
+                matched = self._is_set(term.column)
+            else:
+                # Empty values never contain the needle, so a negated match keeps
+                # them, like SQL's "column IS NULL OR NOT column LIKE ..."
+                matched = self._contains(term.column, value.lower())
+            mask &= ~matched if term.negated else matched
+
+        for column, (start, end) in (date_ranges or {}).items():
+            days = self._days[column][:size]
+            mask &= days != NULL_DAY
+            if start is not None:
+                mask &= days >= start
+            if end is not None:
+                mask &= days <= end
+
+        if rate_range is not None:
+            low, high, currency = rate_range
+            cents = self._rate_cents[:size]
+            mask &= cents != NULL_RATE
+            mask &= self._currencies[:size] == rates.CURRENCY_CODES.index(currency)
+            if low is not None:
+                mask &= cents >= low
+            if high is not None:
+                mask &= cents <= high
+        return mask
+
+    def _sort_key(self, column, rows):
+        """(is_null, value) arrays for ordering rows by `column`"""
+        if column == 'rate_hourly_cents':
+            values = self._rate_cents[rows]
+            return values == NULL_RATE, values
+        if column in self._days:
+            values = self._days[column][rows].astype(np.int64)
+            return values == NULL_DAY, values
+        codes = self._codes[column][rows]
+        ranks = self._dictionaries[column].ranks()
+        return codes == NULL_CODE, np.where(codes == NULL_CODE, 0, ranks[codes]) if len(ranks) else codes
+
+    def search(self, query='', date_ranges=None, rate_range=None, filters=(), sort=None):
+        """Rows matching `query` in any search column and inside every range.
+
+        `date_ranges` maps a date column to an inclusive (start, end) pair of
+        epoch days and `rate_range` is an inclusive (low, high) pair of hourly
+        cents plus the currency they are in; either end may be None. `filters`
+        and `sort` come from a parsed filter expression
+        (query_lang.ParsedQuery.filters() and .sort).
+        Results are ordered like the SQL path: by the sort column with empty
+        values last, then newest submission first.
+        """
+        with self._lock:
+            rows = np.nonzero(self._mask(query.lower(), date_ranges, rate_range, filters))[0]
+            days = self._days['submission_date'][rows]
+            keys = [self._ids[rows], -days.astype(np.int64)]
+            if sort is not None:
+                column, descending = sort
+                nulls, values = self._sort_key(column, rows)
+                keys += [-values if descending else values, nulls]
+            order = rows[np.lexsort(keys)]
+            return [self._record(row) for row in order]
+
+    def _counts(self, column, mask):
+        codes = self._codes[column][:self._size][mask]
+        codes = codes[codes != NULL_CODE]
+        dictionary = self._dictionaries[column]
+        counts = np.bincount(codes, minlength=len(dictionary.values))
+        return {dictionary.values[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def stats(self, date_ranges=None):
+        """Submission counts overall, per firm, per position and per month"""
+        with self._lock:
+            mask = self._mask('', date_ranges)
+            submitted = self._days['submission_date'][:self._size][mask]
+            months, month_counts = np.unique(
+                submitted.astype('datetime64[D]').astype('datetime64[M]'), return_counts=True
+            )
+            return {
+                'total': int(mask.sum()),
+                'with_interview': int((self._days['interview_date'][:self._size][mask] != NULL_DAY).sum()),
+                'with_follow_up': int((self._days['follow_up_date'][:self._size][mask] != NULL_DAY).sum()),
+                'by_firm': self._counts('recruiter_firm', mask),
+                'by_position': self._counts('position', mask),
+                'by_month': {str(month): int(count) for month, count in zip(months, month_counts)}
+            }
+
+    def _grouped_rate_stats(self, column, mask):
+        dictionary = self._dictionaries[column]
+        codes = self._codes[column][:self._size][mask]
+        cents = self._rate_cents[:self._size][mask]
+        order = np.lexsort((cents, codes))
+        codes, cents = codes[order], cents[order]
+        buckets = np.minimum(cents // (rates.HISTOGRAM_WIDTH * 100), rates.HISTOGRAM_BUCKETS - 1)
+        bucket_counts = np.bincount(
+            codes.astype(np.int64) * rates.HISTOGRAM_BUCKETS + buckets,
+            minlength=len(dictionary.values) * rates.HISTOGRAM_BUCKETS
+        ).reshape(-1, rates.HISTOGRAM_BUCKETS)
+
+        groups = {}
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+        ends = np.append(starts[1:], len(codes))
+        for start, end in zip(starts, ends):
+            if start == end:
+                continue
+            code = int(codes[start])
+            groups[dictionary.values[code]] = rates.summarize(cents[start:end], bucket_counts[code])
+        return groups
+
+    def rate_stats(self, date_ranges=None, currency=rates.DEFAULT_CURRENCY):
+        """Hourly rate percentiles and histograms overall, per firm and per position, for one currency"""
+        with self._lock:
+            mask = self._mask('', date_ranges, (None, None, currency))
+            cents = np.sort(self._rate_cents[:self._size][mask])
+            buckets = np.minimum(cents // (rates.HISTOGRAM_WIDTH * 100), rates.HISTOGRAM_BUCKETS - 1)
+            return {
+                'currency': currency,
+                'overall': rates.summarize(cents, np.bincount(buckets, minlength=rates.HISTOGRAM_BUCKETS)),
+                'by_firm': self._grouped_rate_stats('recruiter_firm', mask),
+                'by_position': self._grouped_rate_stats('position', mask)
+            }
+
+    def verify(self, records):
+        """Compare against authoritative rows and return a list of differences"""
+        problems = []
+        with self._lock:
+            seen = set()
+            for record in records:
+                expected = {field: record.get(field) for field in FIELDS}
+                for column in DATE_COLUMNS:
+                    expected[column] = format_epoch_day(to_epoch_day(expected[column]))
+                seen.add(expected['id'])
+                row = self._row_of.get(expected['id'])
+                if row is None:
+                    problems.append(f"id {expected['id']}: missing from read model")
+                    continue
+                actual = self._record(row)
+                for field in FIELDS:
+                    if actual[field] != expected[field]:
+                        problems.append(f"id {expected['id']}: {field} is {actual[field]!r}, "
+                                        f"database has {expected[field]!r}")
+            for id in sorted(set(self._row_of) - seen):
+                problems.append(f"id {id}: in read model but not in database")
+        return problems
+
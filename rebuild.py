@@ -0,0 +1,234 @@
+import os
+import time
+import sqlite3
+import logging
+
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+import rates
+from epoch_days import to_epoch_day
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+CHECKPOINT_TABLE = '_rebuild_checkpoint'
+
+
+def copy(name, default=None):
+    """Mapping entry: take a source column, or `default` when it is missing or NULL"""
+    def mapper(record):
+        value = record.get(name)
+        return default if value is None else value
+    return mapper
+
+
+def const(value):
+    """Mapping entry: always write `value`"""
+    return lambda record: value
+
+
+def rate_part(field):
+    """Mapping entry: one field of the normalized source `rate` (see rates.parse_rate)"""
+    return lambda record: getattr(rates.parse_rate(record.get('rate')), field)
+
+
+def epoch_day_of(name):
+    """Mapping entry: a source date column as days since 1970-01-01 (None if unparseable)"""
+    def mapper(record):
+        try:
+            return to_epoch_day(record.get(name))
+        except ValueError:
+            return None
+    return mapper
+
+
+def model_ddl(table):
+    """CREATE TABLE and CREATE INDEX statements for a SQLAlchemy table"""
+    dialect = sqlite_dialect.dialect()
+    statements = [str(CreateTable(table).compile(dialect=dialect))]
+    statements.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes)
+    return statements
+
+
+def _resolve(mapping):
+    return {dest: copy(source) if isinstance(source, str) else source for dest, source in mapping.items()}
+
+
+def source_fingerprint(path):
+    """Size, mtime and SQLite's file change counter of a database (and its WAL file).
+
+    Any write to the source changes at least one of them, so a checkpoint taken
+    against an older fingerprint no longer describes the rows to copy.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        # Bytes 24-27 of the header count the transactions committed to the file
+        change_counter = int.from_bytes(f.read(100)[24:28], 'big')
+    parts = [stat.st_size, stat.st_mtime_ns, change_counter]
+    if os.path.exists(path + '-wal'):
+        wal = os.stat(path + '-wal')
+        parts.extend([wal.st_size, wal.st_mtime_ns])
+    return ':'.join(str(part) for part in parts)
+
+
+def _read_checkpoint(conn, source_path, source_table):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (CHECKPOINT_TABLE,)
+    ).fetchone()
+    if not exists:
+        return None
+    try:
+        row = conn.execute(
+            f"SELECT source, source_table, fingerprint, last_rowid, rows FROM {CHECKPOINT_TABLE}"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Checkpoint from before fingerprints were recorded
+        return None
+    if row is None or row[0] != os.path.abspath(source_path) or row[1] != source_table:
+        return None
+    if row[2] != source_fingerprint(source_path):
+        logger.warning(f"{source_path} changed since the interrupted rebuild; starting over")
+        return None
+    return row[3], row[4]
+
+
+def _carry_tables(work, carry):
+    """Copy whole side tables from the attached source as part of the final transaction"""
+    for name, statements in carry.items():
+        source_columns = [row[1] for row in work.execute(f"PRAGMA src.table_info({name})")]
+        if not source_columns:
+            continue
+        for statement in statements:
+            work.execute(statement)
+        target_columns = {row[1] for row in work.execute(f"PRAGMA main.table_info({name})")}
+        columns = ', '.join(column for column in source_columns if column in target_columns)
+        work.execute(f"INSERT INTO main.{name} ({columns}) SELECT {columns} FROM src.{name}")
+
+
+def rebuild_table(source_path, target_path, table, create_sql, mapping,
+                  source_table=None, batch_size=DEFAULT_BATCH_SIZE, work_path=None, carry=None):
+    """Copy a table into a freshly created database and swap it in place of target_path.
+
+    Rows are streamed from the source with fetchmany() and written with one
+    executemany() transaction per batch, so memory stays flat however large the
+    table is. Each batch commits a checkpoint (the last source rowid) alongside
+    the rows; if the run is interrupted, calling this again with the same
+    arguments resumes from the checkpoint, unless the source has been written
+    to in the meantime (see source_fingerprint()), in which case the copy
+    starts over. The finished database replaces
+    target_path with a single atomic os.replace().
+
+    `mapping` maps each destination column to a source column name or to a
+    callable that receives the source row as a dict (see copy() and const()).
+    `carry` maps other table names to their DDL; those tables are copied over
+    unchanged (when the source has them) just before the swap.
+    """
+    source_table = source_table or table
+    work_path = work_path or target_path + '.rebuild'
+    mapping = _resolve(mapping)
+    columns = list(mapping)
+    insert_sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+    work = sqlite3.connect(work_path)
+    checkpoint = _read_checkpoint(work, source_path, source_table)
+    if checkpoint is None:
+        work.close()
+        os.remove(work_path)
+        work = sqlite3.connect(work_path)
+        with work:
+            for statement in create_sql:
+                work.execute(statement)
+            work.execute(
+                f"CREATE TABLE {CHECKPOINT_TABLE} "
+                "(source TEXT, source_table TEXT, fingerprint TEXT, last_rowid INTEGER, rows INTEGER)"
+            )
+            work.execute(
+                f"INSERT INTO {CHECKPOINT_TABLE} VALUES (?, ?, ?, 0, 0)",
+                (os.path.abspath(source_path), source_table, source_fingerprint(source_path))
+            )
+        last_rowid, rows = 0, 0
+    else:
+        last_rowid, rows = checkpoint
+        logger.info(f"Resuming rebuild of {table} after source rowid {last_rowid} ({rows} rows done)")
+    resumed_from = rows
+
+    started = time.perf_counter()
+    source = sqlite3.connect(source_path)
+    try:
+        cursor = source.execute(
+            f"SELECT rowid AS _rowid_, * FROM {source_table} WHERE rowid > ? ORDER BY rowid",
+            (last_rowid,)
+        )
+        names = [description[0] for description in cursor.description]
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            records = [dict(zip(names, row)) for row in batch]
+            with work:
+                work.executemany(
+                    insert_sql,
+                    ([mapper(record) for mapper in mapping.values()] for record in records)
+                )
+                last_rowid = records[-1]['_rowid_']
+                rows += len(records)
+                work.execute(
+                    f"UPDATE {CHECKPOINT_TABLE} SET last_rowid = ?, rows = ?", (last_rowid, rows)
+                )
+    finally:
+        source.close()
+
+    if carry:
+        work.execute("ATTACH DATABASE ? AS src", (source_path,))
+    with work:
+        # sqlite3 does not open a transaction for DDL on its own; without this the
+        # carried CREATE TABLEs would commit even if a later insert fails
+        work.execute("BEGIN")
+        if carry:
+            _carry_tables(work, carry)
+        work.execute(f"DROP TABLE {CHECKPOINT_TABLE}")
+    if carry:
+        work.execute("DETACH DATABASE src")
+    work.close()
+    os.replace(work_path, target_path)
+
+    elapsed = time.perf_counter() - started
+    copied = rows - resumed_from
+    rate = copied / elapsed if elapsed > 0 else float(copied)
+    logger.info(f"Rebuilt {table}: {copied} rows in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return {
+        'rows': rows,
+        'copied': copied,
+        'resumed_from': resumed_from,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rate, 1)
+    }
+
+
+# How older resume_submission tables map onto the current model. Columns the
+# source does not have fall back to their defaults.
+RESUME_SUBMISSION_MAPPING = {
+    'id': 'id',
+    'recruiter_firm': copy('recruiter_firm', ''),
+    'client_name': copy('client_name', ''),
+    'recruiter_name': copy('recruiter_name', ''),
+    'recruiter_contact': copy('recruiter_contact', ''),
+    'submission_date': 'submission_date',
+    'job_id': copy('job_id', ''),
+    'position': copy('position', 'Not Specified'),
+    'rate': 'rate',
+    'notes': 'notes',
+    'interview_date': 'interview_date',
+    'follow_up_date': 'follow_up_date',
+    'rate_hourly_cents': rate_part('hourly_cents'),
+    'rate_period': rate_part('period'),
+    'rate_currency': rate_part('currency'),
+    'submission_day': epoch_day_of('submission_date'),
+    'interview_day': epoch_day_of('interview_date'),
+    'follow_up_day': epoch_day_of('follow_up_date'),
+    'row_version': copy('row_version', 1)
+}
@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 import webbrowser
 from threading import Timer
 from app import app, db
@@ -15,21 +16,39 @@ def init_db():
             db.create_all()
             print("Database initialized successfully!")
 
-def open_browser():
+def open_browser(port=5000):
     """Open the browser after a short delay"""
-    webbrowser.open('http://127.0.0.1:5000/')
+    webbrowser.open(f'http://127.0.0.1:{port}/')
 
-def run_app():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Resume Tracker application")
+    parser.add_argument('--port', type=int, default=5000, help="port to listen on")
+    parser.add_argument('--no-browser', action='store_true', help="do not open a browser window")
+    parser.add_argument('--asgi', action='store_true', help="serve asgi.application with uvicorn instead of the threaded server")
+    return parser.parse_args(argv)
+
+def run_app(argv=None):
     """Initialize database and run the application"""
+    args = parse_args(argv)
     try:
         # Initialize the database
         init_db()
         
         # Open browser after 1.5 seconds
-        Timer(1.5, open_browser).start()
+        if not args.no_browser:
+            Timer(1.5, open_browser, args=(args.port,)).start()
         
         # Run the Flask application
-        app.run(port=5000)
+        if args.asgi:
+            try:
+                import uvicorn
+            except ImportError:
+                print("--asgi needs uvicorn (pip install uvicorn)")
+                sys.exit(1)
+            from asgi import application
+            uvicorn.run(application, host='127.0.0.1', port=args.port, log_level='warning')
+        else:
+            app.run(port=args.port)
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,194 @@
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from flask import g, has_app_context, request, session
+from flask_sqlalchemy.session import Session
+
+logger = logging.getLogger(__name__)
+
+TENANT_HEADER = 'X-Tracker-User'
+TENANT_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$')
+
+
+def normalize_tenant(tenant):
+    """Validate a tenant name and fold it to lower case.
+
+    Shards are files named after the tenant, and on case-insensitive file
+    systems "Alice" and "alice" would otherwise share one file under two engines.
+    """
+    if not TENANT_PATTERN.match(tenant or ''):
+        raise ValueError(f"Invalid tenant name: {tenant!r}")
+    return tenant.lower()
+
+
+class UnknownTenant(LookupError):
+    """Raised for a tenant that is not on the configured allow-list"""
+
+
+class RoutingSession(Session):
+    """Session that sends every statement to the shard picked for the current request"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            engine = g.get('shard_engine')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ShardRouter:
+    """Maps each configured tenant to its own SQLite file and keeps a bounded LRU of open engines
+
+    Only tenants on the allow-list get a shard; a name coming from a request
+    never creates one.
+    """
+
+    def __init__(self, shard_dir, metadata, migrate, tenants, max_engines=32):
+        self.shard_dir = shard_dir
+        self.metadata = metadata
+        self.migrate = migrate
+        self.max_engines = max_engines
+        self.allowed = frozenset(normalize_tenant(tenant) for tenant in tenants)
+        if not self.allowed:
+            logger.warning("Multi-tenant mode has no tenants configured; every request will be refused")
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per tenant, so opening and migrating a shard only holds up
+        # requests for that same tenant. The set is fixed, so this never grows.
+        self._tenant_locks = {tenant: threading.Lock() for tenant in self.allowed}
+        os.makedirs(shard_dir, exist_ok=True)
+
+    def shard_path(self, tenant):
+        return os.path.join(self.shard_dir, f'{normalize_tenant(tenant)}.db')
+
+    def _tenant_lock(self, tenant):
+        lock = self._tenant_locks.get(tenant)
+        if lock is None:
+            raise UnknownTenant(f"Unknown tenant: {tenant!r}")
+        return lock
+
+    def _open(self, path):
+        engine = sa.create_engine(f'sqlite:///{path}')
+        self.metadata.create_all(engine)
+        self.migrate(engine)
+        return engine
+
+    def engine_for(self, tenant):
+        """Return the engine for a configured tenant, opening (and migrating) its shard on first use"""
+        tenant = normalize_tenant(tenant)
+        engine = self._cached(tenant)
+        if engine is not None:
+            return engine
+
+        with self._tenant_lock(tenant):
+            # Another request may have opened it while this one waited
+            engine = self._cached(tenant)
+            if engine is not None:
+                return engine
+            path = self.shard_path(tenant)
+            logger.info(f"Opening shard for tenant '{tenant}': {path}")
+            engine = self._open(path)
+            with self._lock:
+                self._engines[tenant] = engine
+                while len(self._engines) > self.max_engines:
+                    evicted, old_engine = self._engines.popitem(last=False)
+                    logger.info(f"Closing idle shard for tenant '{evicted}'")
+                    # Connections still checked out by in-flight requests stay valid;
+                    # dispose() only drops the pooled ones.
+                    old_engine.dispose()
+            return engine
+
+    def _cached(self, tenant):
+        with self._lock:
+            engine = self._engines.get(tenant)
+            if engine is not None:
+                self._engines.move_to_end(tenant)
+            return engine
+
+    def tenants(self):
+        """List the tenants that have a shard file on disk"""
+        return sorted(
+            name[:-3] for name in os.listdir(self.shard_dir)
+            if name.endswith('.db') and name == name.lower() and TENANT_PATTERN.match(name[:-3])
+        )
+
+    def fold_shard_names(self):
+        """Rename shards written before tenant names were case-folded (Foo.db -> foo.db)
+
+        A shard whose lower-case name is already taken is left alone and logged,
+        since the two files hold different data.
+        """
+        renamed = []
+        for name in sorted(os.listdir(self.shard_dir)):
+            tenant = name[:-3]
+            if not name.endswith('.db') or tenant == tenant.lower() or not TENANT_PATTERN.match(tenant):
+                continue
+            source = os.path.join(self.shard_dir, name)
+            target = self.shard_path(tenant)
+            if os.path.exists(target) and not os.path.samefile(source, target):
+                logger.error(f"Cannot rename shard {name}: {os.path.basename(target)} already exists")
+                continue
+            for suffix in ('', '-wal', '-shm', '-journal'):
+                if os.path.exists(source + suffix):
+                    # Go through a temporary name so case-insensitive file systems see a change
+                    temporary = target + suffix + '.renaming'
+                    os.replace(source + suffix, temporary)
+                    os.replace(temporary, target + suffix)
+            logger.info(f"Renamed shard {name} to {os.path.basename(target)}")
+            renamed.append(tenant.lower())
+        return renamed
+
+    def migrate_all(self):
+        """Create or migrate the shard of every configured tenant without filling the LRU"""
+        self.fold_shard_names()
+        tenants = sorted(self.allowed)
+        for tenant in tenants:
+            with self._tenant_lock(tenant):
+                engine = self._open(self.shard_path(tenant))
+            engine.dispose()
+        stray = sorted(set(self.tenants()) - self.allowed)
+        if stray:
+            logger.warning(f"Shards for unconfigured tenants are not served: {', '.join(stray)}")
+        logger.info(f"Migrated {len(tenants)} shard(s) in {self.shard_dir}")
+        return tenants
+
+    def dispose(self):
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+    def open_engines(self):
+        with self._lock:
+            return list(self._engines)
+
+
+def tenant_from_request():
+    """Work out which tenant the current request belongs to.
+
+    The ``X-Tracker-User`` header wins; a ``?user=`` query parameter is remembered
+    in the session so the browser's follow-up fetches land on the same shard.
+    """
+    tenant = request.headers.get(TENANT_HEADER)
+    if not tenant:
+        tenant = request.args.get('user')
+        if tenant:
+            session['tenant'] = tenant
+    if not tenant:
+        tenant = session.get('tenant')
+    return tenant
+
+
+if __name__ == '__main__':
+    from app import app, shard_router
+
+    if shard_router is None:
+        print("Multi-tenant mode is off; set RESUME_TRACKER_MULTI_TENANT=1 to migrate shards")
+    else:
+        with app.app_context():
+            migrated = shard_router.migrate_all()
+        print(f"Migrated {len(migrated)} shard(s): {', '.join(migrated) or '(none)'}")
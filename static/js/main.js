@@ -1,23 +1,3 @@
-// Function to format contact information as clickable links
-function formatContactInfo(contact) {
-    if (!contact) return '';
-    
-    // Email
-    contact = contact.replace(/([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9._-]+)/gi, '<a href="mailto:$1">$1</a>');
-    
-    // Phone numbers (various formats)
-    contact = contact.replace(/(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}/g, function(match) {
-        const cleanNumber = match.replace(/[^\d+]/g, '');
-        return `<a href="tel:${cleanNumber}">${match}</a>`;
-    });
-    
-    // URLs
-    contact = contact.replace(/(https?:\/\/[^\s]+)/g, '<a href="$1" target="_blank">$1</a>');
-    contact = contact.replace(/(?<!:\/\/)(www\.[^\s]+)/g, '<a href="http://$1" target="_blank">$1</a>');
-    
-    return contact;
-}
-
 let csrfToken = null;
 
 // Function to get CSRF token
@@ -73,12 +53,16 @@ async function refreshTable() {
     try {
         console.log('Refreshing table...');
         const searchQuery = document.querySelector('input[type="text"]')?.value || '';
-        const response = await fetch('/search?query=' + encodeURIComponent(searchQuery));
+        // Keep any date range filters (e.g. ?submission_date_from=...) the page was opened with
+        const params = new URLSearchParams(window.location.search);
+        params.set('query', searchQuery);
+        // Rows come back as ready-made <tr> markup, assembled server-side from cached fragments
+        params.set('format', 'html');
+        const response = await fetch('/search?' + params.toString());
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const data = await response.json();
-        console.log('Got submissions:', data);
+        const rows = await response.text();
         
         const tbody = document.querySelector('#submissionsTable');
         if (!tbody) {
@@ -86,49 +70,7 @@ async function refreshTable() {
             return;
         }
         
-        tbody.innerHTML = '';
-        data.forEach((submission, index) => {
-            const tr = document.createElement('tr');
-            tr.dataset.id = submission.id;
-            
-            tr.innerHTML = `
-                <td>${index + 1}</td>
-                <td>${submission.submission_date}</td>
-                <td>${submission.recruiter_firm}</td>
-                <td>${submission.client_name}</td>
-                <td>${submission.recruiter_name}</td>
-                <td>${formatContactInfo(submission.recruiter_contact)}</td>
-                <td>${submission.position}</td>
-                <td>${submission.rate || ''}</td>
-                <td>${submission.job_id}</td>
-                <td>${submission.interview_date || ''}</td>
-                <td>${submission.follow_up_date || ''}</td>
-                <td>
-                    <button class="btn btn-info btn-sm edit-btn" 
-                            data-id="${submission.id}"
-                            data-recruiter-firm="${submission.recruiter_firm}"
-                            data-client-name="${submission.client_name}"
-                            data-recruiter-name="${submission.recruiter_name}"
-                            data-recruiter-contact="${submission.recruiter_contact}"
-                            data-position="${submission.position}"
-                            data-rate="${submission.rate || ''}"
-                            data-job-id="${submission.job_id}"
-                            data-submission-date="${submission.submission_date}"
-                            data-interview-date="${submission.interview_date || ''}"
-                            data-follow-up-date="${submission.follow_up_date || ''}"
-                            data-notes="${submission.notes || ''}"
-                            data-bs-toggle="modal" 
-                            data-bs-target="#submissionModal">
-                        <i class="bi bi-pencil"></i>
-                    </button>
-                    <button class="btn btn-danger btn-sm delete-btn" data-id="${submission.id}">
-                        <i class="bi bi-trash"></i>
-                    </button>
-                </td>
-            `;
-            
-            tbody.appendChild(tr);
-        });
+        tbody.innerHTML = rows;
         
         // Reattach event listeners
         attachEventListeners();
@@ -0,0 +1,67 @@
+import os
+import shutil
+import itertools
+import tempfile
+from datetime import datetime
+
+import pytest
+
+# Point the app at a scratch directory before it is imported: the database URI
+# (and so the file create_all/drop_all touch) is fixed when app.py is loaded.
+_scratch = tempfile.mkdtemp(prefix='resume-tracker-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_scratch, 'resume_tracker.db')}"
+os.environ['RESUME_TRACKER_BACKUP_DIR'] = os.path.join(_scratch, 'backups')
+os.environ['RESUME_TRACKER_ATTACHMENT_DIR'] = os.path.join(_scratch, 'attachments')
+os.environ['RESUME_TRACKER_SHARD_DIR'] = os.path.join(_scratch, 'shards')
+
+from app import app, db, ResumeSubmission  # noqa: E402
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_scratch, ignore_errors=True)
+
+
+@pytest.fixture
+def database():
+    """Fresh tables in the scratch database, dropped again after the test"""
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(database):
+    """Test client with CSRF checks off, so tests can post forms directly"""
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.test_client() as client:
+        yield client
+    app.config['WTF_CSRF_ENABLED'] = True
+
+
+@pytest.fixture
+def make_submission(database):
+    """Add a ResumeSubmission with sensible defaults; keyword arguments override them.
+
+    Rows are added to the session but not committed.
+    """
+    numbers = itertools.count()
+
+    def make(**fields):
+        number = next(numbers)
+        values = {
+            'recruiter_firm': 'Test Firm',
+            'client_name': 'Test Client',
+            'recruiter_name': 'Jane Agent',
+            'recruiter_contact': 'jane@example.com',
+            'job_id': f'JOB{number}',
+            'position': 'Engineer',
+            'submission_date': datetime(2025, 1, 9)
+        }
+        values.update(fields)
+        submission = ResumeSubmission(**values)
+        db.session.add(submission)
+        return submission
+    return make
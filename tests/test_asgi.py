@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip('asgiref')
+
+from app import app, db
+from asgi import ResumeTrackerAsgi
+from db_executor import BoundedExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(max_workers=2, max_queue=50)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def asgi_app(client, make_submission, executor):
+    make_submission(recruiter_firm='Async Firm')
+    db.session.commit()
+    return ResumeTrackerAsgi(app, executor)
+
+
+async def _request(asgi_app, path, query=b'', method='GET'):
+    """Run one request through the ASGI app and return (status, body)"""
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': query,
+        'headers': [(b'host', b'localhost')], 'server': ('localhost', 80), 'client': ('127.0.0.1', 5000)
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    status = next(m['status'] for m in messages if m['type'] == 'http.response.start')
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return status, body
+
+
+def test_search_matches_the_wsgi_response(asgi_app, client, executor):
+    status, body = asyncio.run(_request(asgi_app, '/search', b'query=async'))
+    assert status == 200
+    assert body == client.get('/search?query=async').get_data()
+    assert executor.stats()['completed'] == 1
+
+
+def test_concurrent_reads_share_the_executor_threads(asgi_app, executor):
+    async def burst():
+        requests = [_request(asgi_app, '/search', b'query=async') for _ in range(10)]
+        requests += [_request(asgi_app, '/') for _ in range(10)]
+        return await asyncio.gather(*requests)
+
+    threads = threading.active_count()
+    results = asyncio.run(burst())
+    assert [status for status, _ in results] == [200] * 20
+    assert all(b'Async Firm' in body for _, body in results)
+    assert executor.stats()['completed'] == 20
+    # Only the executor's two workers were added, not a thread per request
+    assert threading.active_count() <= threads + 2
+
+
+def test_full_executor_answers_503(client):
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+    executor.submit(release.wait)
+    try:
+        status, body = asyncio.run(_request(ResumeTrackerAsgi(app, executor), '/search', b'query=async'))
+        assert status == 503
+        assert b'busy' in body
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_other_routes_bypass_the_executor(asgi_app, executor):
+    status, body = asyncio.run(_request(asgi_app, '/stats/executor'))
+    assert status == 200
+    assert executor.stats()['submitted'] == 0
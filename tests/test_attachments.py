@@ -0,0 +1,80 @@
+import io
+import hashlib
+import os
+import pytest
+from app import app, db, Attachment, AttachmentBlob
+
+PDF = b'%PDF-1.4 resume v3 ' + bytes(range(256)) * 512
+
+@pytest.fixture
+def client(client, make_submission, tmp_path):
+    attachment_dir = app.config['ATTACHMENT_DIR']
+    app.config['ATTACHMENT_DIR'] = str(tmp_path / 'attachments')
+    for _ in range(2):
+        make_submission()
+    db.session.commit()
+    yield client
+    app.config['ATTACHMENT_DIR'] = attachment_dir
+
+def _upload(client, submission_id, content=PDF, name='resume.pdf'):
+    return client.post(f'/submissions/{submission_id}/attachments',
+                       data={'file': (io.BytesIO(content), name, 'application/pdf')},
+                       content_type='multipart/form-data')
+
+def _blob_files():
+    root = app.config['ATTACHMENT_DIR']
+    return [name for path, _, names in os.walk(root) for name in names if os.path.basename(path) != 'tmp']
+
+def test_same_file_is_stored_once(client):
+    first = _upload(client, 1)
+    second = _upload(client, 2, name='resume copy.pdf')
+    assert first.status_code == 201 and second.status_code == 201
+    assert first.json['deduplicated'] is False
+    assert second.json['deduplicated'] is True
+    assert second.json['data']['filename'] == 'resume_copy.pdf'
+    assert len(_blob_files()) == 1
+
+    stats = client.get('/stats/attachments').json
+    assert stats['logical_bytes'] == 2 * len(PDF)
+    assert stats['saved_bytes'] == len(PDF)
+    assert [a['id'] for a in client.get('/submissions/1/attachments').json] == [first.json['data']['id']]
+
+def test_download_supports_ranges(client):
+    attachment_id = _upload(client, 1).json['data']['id']
+    full = client.get(f'/attachments/{attachment_id}')
+    assert full.status_code == 200 and full.data == PDF
+    partial = client.get(f'/attachments/{attachment_id}', headers={'Range': 'bytes=100-199'})
+    assert partial.status_code == 206
+    assert partial.data == PDF[100:200]
+    assert client.get('/attachments/999').status_code == 404
+
+def test_deleting_submissions_collects_garbage(client):
+    _upload(client, 1)
+    _upload(client, 2)
+    assert client.post('/delete/1').json['status'] == 'success'
+    assert db.session.get(AttachmentBlob, Attachment.query.one().sha256).ref_count == 1
+    assert len(_blob_files()) == 1
+
+    assert client.post('/delete/2').json['status'] == 'success'
+    assert AttachmentBlob.query.count() == 0
+    assert _blob_files() == []
+
+def test_upload_to_missing_submission(client):
+    assert _upload(client, 999).status_code == 404
+    assert client.post('/submissions/1/attachments', data={}).status_code == 400
+
+def test_upload_is_hashed_while_parsed(client, monkeypatch):
+    def no_second_copy(self, stream, chunk_size=None):
+        raise AssertionError("upload copied after parsing")
+
+    monkeypatch.setattr('attachments.ContentStore.receive', no_second_copy)
+    response = _upload(client, 1)
+    assert response.status_code == 201
+    assert response.json['data']['sha256'] == hashlib.sha256(PDF).hexdigest()
+    assert response.json['data']['size'] == len(PDF)
+    assert os.listdir(os.path.join(app.config['ATTACHMENT_DIR'], 'tmp')) == []
+
+def test_unused_upload_is_removed_with_the_request(client):
+    client.post('/add', data={'recruiter_firm': 'Firm', 'file': (io.BytesIO(PDF), 'stray.pdf')},
+                content_type='multipart/form-data')
+    assert os.listdir(os.path.join(app.config['ATTACHMENT_DIR'], 'tmp')) == []
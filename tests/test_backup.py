@@ -0,0 +1,64 @@
+import time
+import sqlite3
+import pytest
+from app import app
+import backup
+
+@pytest.fixture
+def live_db(tmp_path):
+    path = str(tmp_path / 'live.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO t (value) VALUES (?)", [(f'row {i}',) for i in range(2000)])
+    conn.close()
+    return path
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_backup_restore_round_trip(live_db, tmp_path):
+    backup_dir = str(tmp_path / 'backups')
+    result = backup.backup_database(live_db, backup_dir, pages=4)
+    assert backup.integrity_check(result['snapshot']) == 'ok'
+    assert _count(result['snapshot']) == 2000
+
+    # Restore while a connection to the live database is still open
+    writer = sqlite3.connect(live_db)
+    writer.execute("DELETE FROM t")
+    writer.commit()
+    backup.restore_database(result['snapshot'], live_db)
+    assert writer.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2000
+    writer.close()
+
+def test_retention_keeps_newest(live_db, tmp_path):
+    backup_dir = str(tmp_path / 'backups')
+    taken = [backup.backup_database(live_db, backup_dir, keep=2)['snapshot'] for _ in range(3)]
+    assert backup.list_snapshots(backup_dir, live_db) == taken[:0:-1]
+
+def test_snapshots_do_not_cross_databases(tmp_path):
+    backup_dir = str(tmp_path / 'backups')
+    taken = {}
+    for name in ('alice', 'alice-2'):
+        path = str(tmp_path / f'{name}.db')
+        sqlite3.connect(path).close()
+        taken[path] = backup.backup_database(path, backup_dir)['snapshot']
+    for path, snapshot in taken.items():
+        assert backup.list_snapshots(backup_dir, path) == [snapshot]
+
+def test_backup_endpoint(client, tmp_path):
+    backup_dir = app.config['BACKUP_DIR']
+    app.config['BACKUP_DIR'] = str(tmp_path / 'backups')
+    try:
+        assert client.post('/backup').status_code == 202
+        for _ in range(100):
+            listing = client.get('/backups').json
+            if not listing['running']:
+                break
+            time.sleep(0.05)
+        assert len(listing['snapshots']) == 1
+    finally:
+        app.config['BACKUP_DIR'] = backup_dir
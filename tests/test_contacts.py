@@ -0,0 +1,78 @@
+import sqlite3
+import pytest
+import sqlalchemy as sa
+from datetime import datetime
+from app import db, ContactPoint, ResumeSubmission, upgrade_schema
+from contacts import normalize_phone, parse_contacts
+
+@pytest.fixture
+def client(client, make_submission):
+    for i, contact in enumerate(['Jane <Jane.Doe@Example.com> (555) 123-4567',
+                                 'call 555.123.4567 or www.acme.com/jobs.',
+                                 'n/a']):
+        make_submission(recruiter_contact=contact, submission_date=datetime(2025, 1, 1 + i))
+    db.session.commit()
+    return client
+
+def test_parse_contacts_normalizes():
+    assert parse_contacts('Jane.Doe@Example.com, +44 207 123 4567, https://Acme.com/Jobs, jane.doe@example.com') == [
+        ('email', 'jane.doe@example.com'), ('phone', '+442071234567'), ('url', 'https://acme.com/Jobs')
+    ]
+    assert normalize_phone('1-555-123-4567') == '+15551234567'
+    assert normalize_phone('12345') is None
+
+def test_contacts_kept_in_step_with_recruiter_contact(client):
+    submission = ResumeSubmission.query.filter_by(job_id='JOB0').one()
+    assert submission.to_dict()['contacts'] == [{'kind': 'email', 'value': 'jane.doe@example.com'},
+                                                {'kind': 'phone', 'value': '+15551234567'}]
+    submission.recruiter_contact = 'jane@newfirm.com'
+    db.session.commit()
+    assert [point.value for point in ContactPoint.query.filter_by(submission_id=submission.id)] == ['jane@newfirm.com']
+    db.session.delete(submission)
+    db.session.commit()
+    assert ContactPoint.query.filter_by(submission_id=submission.id).count() == 0
+
+def test_contact_lookup(client):
+    rows = client.get('/contact?phone=(555) 123-4567').json['submissions']
+    assert [row['job_id'] for row in rows] == ['JOB1', 'JOB0']
+    assert client.get('/contact?email=JANE.DOE@example.com').json['submissions'][0]['job_id'] == 'JOB0'
+    assert client.get('/contact?url=http://www.acme.com/jobs').json['submissions'][0]['job_id'] == 'JOB1'
+    assert client.get('/contact?phone=123').status_code == 400
+    assert client.get('/contact').status_code == 400
+    plan = db.session.execute(sa.text(
+        "EXPLAIN QUERY PLAN SELECT submission_id FROM contact_point WHERE kind = 'phone' AND value = '+15551234567'"
+    )).fetchall()
+    assert 'ix_contact_point_kind_value' in str(plan)
+
+def test_upgrade_backfills_contacts(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, recruiter_contact TEXT, "
+                     "submission_date DATETIME, interview_date DATETIME, follow_up_date DATETIME, rate TEXT)")
+        conn.execute("INSERT INTO resume_submission (recruiter_contact) VALUES ('bob@example.com 555-987-6543')")
+    conn.close()
+    engine = sa.create_engine(f'sqlite:///{path}')
+    ContactPoint.__table__.create(engine)
+    upgrade_schema(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT submission_id, kind, value FROM contact_point ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [(1, 'email', 'bob@example.com'), (1, 'phone', '+15559876543')]
+
+def test_contacts_are_backfilled_only_once(tmp_path, monkeypatch):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, recruiter_contact TEXT, "
+                     "submission_date DATETIME, interview_date DATETIME, follow_up_date DATETIME, rate TEXT)")
+        conn.execute("INSERT INTO resume_submission (recruiter_contact) VALUES ('n/a')")
+    conn.close()
+    engine = sa.create_engine(f'sqlite:///{path}')
+    ContactPoint.__table__.create(engine)
+    scans = []
+    monkeypatch.setattr('app.backfill_contacts', scans.append)
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+    engine.dispose()
+    # 'n/a' yields no contact points, so the table stays empty after the first scan
+    assert len(scans) == 1
@@ -0,0 +1,49 @@
+import sqlite3
+import pytest
+import sqlalchemy as sa
+from datetime import datetime
+from app import db, ResumeSubmission, upgrade_schema
+from epoch_days import to_epoch_day
+
+@pytest.fixture
+def client(client, make_submission):
+    for i, day in enumerate([1, 10, 20, 31]):
+        make_submission(submission_date=datetime(2025, 1, day, 15, 45),
+                        interview_date=datetime(2025, 2 + i // 2, day % 28) if i % 2 else None)
+    db.session.commit()
+    return client
+
+def test_epoch_days_follow_dates(client):
+    submission = ResumeSubmission.query.filter_by(job_id='JOB1').one()
+    assert submission.submission_day == to_epoch_day('2025-01-10')
+    assert submission.interview_day == to_epoch_day('2025-02-10')
+    submission.interview_date = None
+    assert submission.interview_day is None
+    assert submission.to_dict()['submission_date'] == '2025-01-10'
+
+def test_search_date_ranges(client):
+    rows = client.get('/search?submission_date_from=2025-01-10&submission_date_to=2025-01-20').json
+    assert sorted(row['job_id'] for row in rows) == ['JOB1', 'JOB2']
+    rows = client.get('/search?interview_date_to=2025-02-28').json
+    assert [row['job_id'] for row in rows] == ['JOB1']
+    assert client.get('/search?submission_date_from=January').status_code == 400
+
+def test_index_date_ranges(client):
+    page = client.get('/?submission_date_from=2025-01-20').get_data(as_text=True)
+    assert 'JOB3' in page and 'JOB2' in page and 'JOB1' not in page
+
+def test_upgrade_backfills_epoch_days(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, submission_date DATETIME, "
+                     "interview_date DATETIME, follow_up_date DATETIME, rate TEXT)")
+        conn.execute("INSERT INTO resume_submission (submission_date, interview_date) "
+                     "VALUES ('2025-01-10 09:30:00.000000', NULL)")
+    conn.close()
+    engine = sa.create_engine(f'sqlite:///{path}')
+    upgrade_schema(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as conn:
+        row = conn.execute("SELECT submission_day, interview_day FROM resume_submission").fetchone()
+    conn.close()
+    assert row == (to_epoch_day('2025-01-10'), None)
@@ -0,0 +1,21 @@
+import threading
+import pytest
+from db_executor import BoundedExecutor, ExecutorSaturated
+
+def test_executor_rejects_when_queue_is_full():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: 'done')
+    with pytest.raises(ExecutorSaturated):
+        executor.submit(lambda: 'rejected')
+
+    stats = executor.stats()
+    assert stats['rejected'] == 1
+    assert stats['saturation'] == 1.0
+
+    release.set()
+    assert running.result(timeout=5) is True
+    assert queued.result(timeout=5) == 'done'
+    assert executor.stats()['completed'] == 2
+    executor.shutdown()
@@ -0,0 +1,90 @@
+import sqlite3
+import pytest
+import sqlalchemy as sa
+from datetime import datetime
+from app import db, ResumeSubmission, row_cache, upgrade_schema
+from contacts import link_contacts
+
+@pytest.fixture
+def client(client, make_submission):
+    for i in range(3):
+        make_submission(recruiter_firm='<b>Firm</b>' if i == 0 else f'Firm {i}',
+                        recruiter_contact=f'jane{i}@example.com 555-123-456{i}',
+                        submission_date=datetime(2025, 1, 1 + i, 9, 30))
+    db.session.commit()
+    return client
+
+def test_link_contacts_escapes_and_links():
+    html = link_contacts('jane@example.com, (555) 123-4567 <x> www.example.com/jane')
+    assert '<a href="mailto:jane@example.com">jane@example.com</a>' in html
+    assert '<a href="tel:+15551234567">(555) 123-4567</a>' in html
+    assert '<a href="http://www.example.com/jane" target="_blank">' in html
+    assert '&lt;x&gt;' in html
+
+def test_index_and_html_search_share_fragments(client):
+    row_cache.clear()
+    page = client.get('/').get_data(as_text=True)
+    assert '&lt;b&gt;Firm&lt;/b&gt;' in page
+    assert 'href="mailto:jane2@example.com"' in page
+    misses = row_cache.stats()['misses']
+
+    rows = client.get('/search?format=html&query=firm').get_data(as_text=True)
+    assert row_cache.stats()['misses'] == misses
+    # Row numbers follow the listing, not the cached fragment
+    first = ResumeSubmission.query.filter_by(job_id='JOB2').one()
+    assert rows.startswith(f'<tr data-id="{first.id}"><td>1</td>')
+    only = client.get('/search?format=html&query=job0').get_data(as_text=True)
+    assert '<td>1</td>' in only and 'JOB0' in only
+
+def test_edit_invalidates_only_that_row(client):
+    row_cache.clear()
+    client.get('/')
+    submission = ResumeSubmission.query.filter_by(job_id='JOB1').one()
+    version = submission.row_version
+    before = row_cache.stats()
+    response = client.post(f'/edit/{submission.id}', data={
+        'recruiter_firm': 'Renamed', 'client_name': 'Client', 'recruiter_name': 'Jane Agent',
+        'recruiter_contact': 'jane1@example.com', 'submission_date': '2025-01-02',
+        'position': 'Engineer', 'rate': '', 'job_id': 'JOB1'
+    })
+    assert response.json['data']['row_version'] != version
+    page = client.get('/').get_data(as_text=True)
+    after = row_cache.stats()
+    assert 'Renamed' in page
+    assert after['invalidations'] - before['invalidations'] == 1
+    assert after['misses'] - before['misses'] == 1
+    assert after['hits'] - before['hits'] == 2
+
+def test_upgrade_adds_row_version(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, submission_date DATETIME, "
+                     "interview_date DATETIME, follow_up_date DATETIME, rate TEXT)")
+        conn.execute("INSERT INTO resume_submission (submission_date) VALUES ('2025-01-10 09:30:00.000000')")
+    conn.close()
+    engine = sa.create_engine(f'sqlite:///{path}')
+    upgrade_schema(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT row_version FROM resume_submission").fetchone() == (1,)
+    conn.close()
+
+def test_warm_html_search_reads_only_ids_and_versions(client):
+    client.get('/')
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa.event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        rows = client.get('/search?format=html&query=firm').get_data(as_text=True)
+    finally:
+        sa.event.remove(db.engine, 'before_cursor_execute', record)
+    assert rows.count('<tr data-id=') == 3
+    assert len(statements) == 1
+    assert statements[0].startswith('SELECT resume_submission.id, resume_submission.row_version \nFROM')
+
+def test_row_versions_fit_in_a_javascript_number(client):
+    versions = [row['row_version'] for row in client.get('/search').json]
+    assert versions and all(0 <= version < 2 ** 53 for version in versions)
@@ -0,0 +1,26 @@
+import sqlite3
+from sqlalchemy.exc import OperationalError
+from app import db
+
+SUBMISSION = {
+    'recruiter_firm': 'Test Firm', 'client_name': 'Test Client', 'recruiter_name': 'Jane Agent',
+    'recruiter_contact': 'jane@example.com', 'submission_date': '2025-01-09',
+    'position': 'Engineer', 'rate': '$50/hr', 'job_id': 'JOB1'
+}
+
+def _failing_commit(message):
+    def commit():
+        raise OperationalError('COMMIT', {}, sqlite3.OperationalError(message))
+    return commit
+
+def test_locked_write_is_a_distinct_503(client, monkeypatch):
+    monkeypatch.setattr(db.session, 'commit', _failing_commit('database is locked'))
+    response = client.post('/add', data=SUBMISSION)
+    assert response.status_code == 503
+    assert response.json['error'] == 'database_locked'
+
+def test_other_database_errors_stay_500(client, monkeypatch):
+    monkeypatch.setattr(db.session, 'commit', _failing_commit('disk I/O error'))
+    response = client.post('/add', data=SUBMISSION)
+    assert response.status_code == 500
+    assert 'error' not in response.json
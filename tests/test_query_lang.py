@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime
+from app import db, ResumeSubmission, query_cache, search_submissions
+from query_lang import QueryCache, QuerySyntaxError, Term, parse
+
+@pytest.fixture
+def client(client, make_submission):
+    for i in range(12):
+        make_submission(
+            recruiter_firm=('Tech Staffing', 'Example Corp', 'Acme')[i % 3],
+            client_name=f'Client {i % 4}',
+            recruiter_contact=f'jane{i}@example.com',
+            position=('Senior Engineer', 'Analyst')[i % 2],
+            rate=None if i % 4 == 0 else f'${50 + i}/hr',
+            submission_date=datetime(2025, 1, 1 + i, 9, 30),
+            interview_date=datetime(2025, 3, 1) if i % 3 == 0 else None,
+            follow_up_date=datetime(2025, 4, 20 - i) if i % 2 == 0 else None
+        )
+    db.session.commit()
+    return client
+
+def test_parse_terms_and_text():
+    parsed = parse('firm:"Tech Staffing" position:engineer has:interview -client:"client 2" remote sort:-follow_up')
+    assert parsed.text == 'remote'
+    assert parsed.terms == (Term('match', 'recruiter_firm', False), Term('match', 'position', False),
+                            Term('has', 'interview_date', False), Term('match', 'client_name', True))
+    assert parsed.values == ('tech staffing', 'engineer', 'client 2')
+    assert parsed.sort == ('follow_up_date', True)
+    assert parse('firm:acme').shape == parse('firm:"example corp"').shape
+    # No keys or quotes: the whole string is one needle, as before
+    assert parse('Client 3').text == 'client 3'
+    with pytest.raises(QuerySyntaxError):
+        parse('sort:salary')
+
+def test_structured_search(client):
+    rows = client.get('/search', query_string={'query': 'firm:"tech staffing" position:engineer has:interview'}).json
+    assert [row['job_id'] for row in rows] == ['JOB6', 'JOB0']
+    rows = client.get('/search', query_string={'query': 'has:follow_up sort:follow_up'}).json
+    assert [row['job_id'] for row in rows] == ['JOB10', 'JOB8', 'JOB6', 'JOB4', 'JOB2', 'JOB0']
+    rows = client.get('/search', query_string={'query': '-has:rate engineer'}).json
+    assert [row['job_id'] for row in rows] == ['JOB8', 'JOB4', 'JOB0']
+    assert client.get('/search', query_string={'query': 'has:salary'}).status_code == 400
+
+def test_statement_cache_reuses_shapes(client):
+    query_cache.clear()
+    before = query_cache.stats()
+    search_submissions('firm:acme')
+    search_submissions('firm:tech')
+    search_submissions('firm:tech')
+    stats = query_cache.stats()
+    assert stats['statement_misses'] - before['statement_misses'] == 1
+    assert stats['statement_hits'] - before['statement_hits'] == 2
+    assert stats['parse_hits'] - before['parse_hits'] == 1
+    assert client.get('/stats/query_cache').json['statements'] == 1
+
+def test_cache_evicts_least_recently_used():
+    cache = QueryCache(max_queries=2, max_statements=2)
+    for query in ('a', 'b', 'a', 'c'):
+        cache.parse(query)
+    assert list(cache._parsed) == ['a', 'c']
+
+@pytest.mark.parametrize('query', ['firm:acme has:rate', '-position:analyst sort:rate',
+                                   'has:interview sort:-firm', 'client:"client 1" jane',
+                                   '-rate:55', '-notes:remote'])
+def test_read_model_matches_sql(client, query):
+    read_model = pytest.importorskip('read_model')
+    pytest.importorskip('numpy')
+    model = read_model.ColumnarReadModel()
+    model.load(db.session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    parsed = parse(query)
+    expected = search_submissions(query)
+    assert model.search(parsed.text, None, None, parsed.filters(), parsed.sort) == expected
+
+def test_blank_fields_from_the_form_are_unset(client):
+    form = {'recruiter_firm': 'Blank Firm', 'client_name': 'Blank Client', 'recruiter_name': 'Jane Agent',
+            'recruiter_contact': 'blank@example.com', 'position': 'Engineer', 'job_id': 'BLANK1',
+            'submission_date': '2025-02-01', 'rate': '', 'notes': ''}
+    assert client.post('/add', data=form).status_code == 200
+
+    def firms(query):
+        return {row['recruiter_firm'] for row in client.get('/search', query_string={'query': query}).json}
+
+    assert 'Blank Firm' not in firms('has:notes')
+    assert 'Blank Firm' not in firms('has:rate')
+    assert 'Blank Firm' in firms('-has:notes')
+    assert 'Blank Firm' in firms('-has:rate')
+
+    read_model = pytest.importorskip('read_model')
+    pytest.importorskip('numpy')
+    model = read_model.ColumnarReadModel()
+    model.load(db.session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    for query in ('has:notes', '-has:notes', 'has:rate', '-has:rate'):
+        parsed = parse(query)
+        assert model.search(parsed.text, None, None, parsed.filters(), parsed.sort) == search_submissions(query)
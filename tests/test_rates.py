@@ -0,0 +1,102 @@
+import sqlite3
+import pytest
+import sqlalchemy as sa
+from datetime import datetime
+from app import db, ResumeSubmission, rate_stats, upgrade_schema
+from rates import parse_rate
+
+@pytest.mark.parametrize('text, expected', [
+    ('$50/hr', (5000, 'hour', 'USD')),
+    ('120k', (5769, 'year', 'USD')),
+    ('65 C2C', (6500, 'hour', 'USD')),
+    ('65 W2', (6500, 'hour', 'USD')),
+    ('$8,000/month', (4615, 'month', 'USD')),
+    ('£400 per day', (5000, 'day', 'GBP')),
+    ('CAD 60-70/hr', (6500, 'hour', 'CAD')),
+    ('C2C $65/hr', (6500, 'hour', 'USD')),
+    ('W2 $50/hr', (5000, 'hour', 'USD')),
+    ('1099 - $60/hr', (6000, 'hour', 'USD')),
+    ('100-110k', (5048, 'year', 'USD')),
+    ('$60/hr remote Europe', (6000, 'hour', 'USD')),
+    ('Rate: 70 per hour, 2 openings', (7000, 'hour', 'USD')),
+    ('€1.000.000/yr', (48077, 'year', 'EUR')),
+    ('Start 5.5.2025, $60/hr', (6000, 'hour', 'USD')),
+    ('1.2.3', (None, None, None)),
+    ('v2.1.0 pay', (None, None, None)),
+    ('5.5.2025', (None, None, None)),
+    ('9' * 400, (None, None, None)),
+    ('DOE', (None, None, None)),
+    ('', (None, None, None)),
+])
+def test_parse_rate(text, expected):
+    assert tuple(parse_rate(text)) == expected
+
+@pytest.fixture
+def client(client, make_submission):
+    for i, rate in enumerate(['$50/hr', '$75/hr', '$90/hr', '150k', 'DOE', None, '£80/hr']):
+        make_submission(recruiter_firm=('Tech Staffing', 'Acme')[i % 2], rate=rate,
+                        submission_date=datetime(2025, 1, 1 + i))
+    db.session.commit()
+    return client
+
+def test_unparseable_rate_is_still_accepted(client):
+    response = client.post('/add', data={
+        'recruiter_firm': 'Firm', 'client_name': 'Client', 'recruiter_name': 'Jane Agent',
+        'recruiter_contact': 'jane@example.com', 'submission_date': '2025-01-09',
+        'position': 'Engineer', 'rate': 'v2.1.0 pay', 'job_id': 'JOB99'
+    })
+    assert response.status_code == 200
+    assert ResumeSubmission.query.filter_by(job_id='JOB99').one().rate_hourly_cents is None
+
+def test_rate_filters(client):
+    above = client.get('/search?min_rate=70').json
+    assert sorted(row['rate'] for row in above) == ['$75/hr', '$90/hr', '150k']
+    between = client.get('/search?min_rate=60&max_rate=73').json
+    assert [row['rate'] for row in between] == ['150k']
+    assert client.get('/search?min_rate=lots').status_code == 400
+
+def test_rate_filters_stay_in_one_currency(client):
+    assert [row['rate'] for row in client.get('/search?min_rate=70&currency=gbp').json] == ['£80/hr']
+    assert [row['rate'] for row in client.get('/search?currency=GBP').json] == ['£80/hr']
+    assert '£80/hr' not in [row['rate'] for row in client.get('/search?min_rate=70').json]
+    assert client.get('/search?min_rate=70&currency=XYZ').status_code == 400
+
+def test_rate_stats(client):
+    stats = client.get('/stats/rates').json
+    assert stats['overall']['count'] == 4
+    assert stats['overall']['median'] == 73.56
+    assert stats['by_firm']['Acme']['count'] == 2
+    assert sum(bucket['count'] for bucket in stats['overall']['histogram']) == 4
+    assert stats['currency'] == 'USD'
+    pounds = client.get('/stats/rates?currency=GBP').json
+    assert pounds['overall']['count'] == 1 and pounds['overall']['median'] == 80
+    assert client.get('/stats/rates?currency=XYZ').status_code == 400
+
+def test_read_model_rate_stats_match_sql(client):
+    pytest.importorskip('numpy')
+    from read_model import ColumnarReadModel
+    model = ColumnarReadModel()
+    model.load(db.session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    assert model.rate_stats() == rate_stats()
+    assert model.rate_stats(currency='GBP') == rate_stats(currency='GBP')
+    for rate_range, args in [((7000, None, 'USD'), 'min_rate=70'), ((7000, None, 'GBP'), 'min_rate=70&currency=GBP')]:
+        assert {row['id'] for row in model.search('', rate_range=rate_range)} == \
+            {row['id'] for row in client.get(f'/search?{args}').json}
+
+def test_upgrade_backfills_rates(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE resume_submission (id INTEGER PRIMARY KEY, recruiter_firm TEXT, "
+                     "client_name TEXT, recruiter_name TEXT, recruiter_contact TEXT, "
+                     "submission_date DATETIME, job_id TEXT, position TEXT, rate TEXT, notes TEXT)")
+        conn.executemany("INSERT INTO resume_submission (rate) VALUES (?)", [('$50/hr',), ('120k',), (None,)])
+    conn.close()
+    engine = sa.create_engine(f'sqlite:///{path}')
+    upgrade_schema(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT rate_hourly_cents, rate_period FROM resume_submission ORDER BY id").fetchall()
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(resume_submission)")]
+    conn.close()
+    assert rows == [(5000, 'hour'), (5769, 'year'), (None, None)]
+    assert 'ix_resume_submission_rate_hourly_cents' in indexes
@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from app import db, ResumeSubmission, rate_stats, search_submissions, submission_stats
+from epoch_days import to_epoch_day
+
+np = pytest.importorskip('numpy')
+from read_model import ColumnarReadModel
+
+@pytest.fixture
+def session(make_submission):
+    for i in range(30):
+        make_submission(
+            recruiter_firm=('Tech Staffing', 'Example Corp', 'Acme')[i % 3],
+            client_name=f'Client {i % 4}',
+            recruiter_contact=f'jane{i}@example.com',
+            position=('Engineer', 'Analyst')[i % 2],
+            rate=None if i % 5 == 0 else f'${50 + i}/hr',
+            submission_date=datetime(2025, 1 + i % 3, 1 + i % 28, 9, 30),
+            interview_date=datetime(2025, 5, 1) if i % 4 == 0 else None
+        )
+    db.session.commit()
+    return db.session
+
+def _model(session):
+    model = ColumnarReadModel(initial_capacity=4)
+    model.load(session.execute(db.select(ResumeSubmission.__table__)).mappings())
+    return model
+
+def _by_id(rows):
+    return {row['id']: row for row in rows}
+
+@pytest.mark.parametrize('query', ['', 'tech', 'client 3', 'job1', '$55', 'nothing'])
+def test_search_matches_sql(session, query):
+    assert _by_id(_model(session).search(query)) == _by_id(search_submissions(query))
+
+def test_date_ranges_and_stats_match_sql(session):
+    model = _model(session)
+    ranges = {'submission_date': (to_epoch_day('2025-02-01'), to_epoch_day('2025-02-28')),
+              'interview_date': (None, to_epoch_day('2025-12-31'))}
+    assert _by_id(model.search('', ranges)) == _by_id(search_submissions('', ranges))
+    assert model.stats() == submission_stats()
+    assert model.stats(ranges) == submission_stats(ranges)
+
+def test_mutations_keep_model_consistent(session):
+    model = _model(session)
+    first = ResumeSubmission.query.order_by(ResumeSubmission.id).first()
+    first.recruiter_firm = 'Renamed Firm'
+    session.commit()
+    model.upsert(first.to_dict())
+    session.delete(session.get(ResumeSubmission, 5))
+    session.commit()
+    model.delete(5)
+
+    assert model.verify(session.execute(db.select(ResumeSubmission.__table__)).mappings()) == []
+    assert [row['id'] for row in model.search('renamed')] == [first.id]
+
+def test_rates_beyond_int32_load_and_match_sql(session, make_submission):
+    make_submission(rate='$99999999/hr')
+    session.commit()
+    model = _model(session)
+    assert model.rate_stats() == rate_stats()
+    assert rate_stats()['overall']['max'] == 99999999
+    huge = make_submission(rate='$50000000/hr')
+    session.commit()
+    model.upsert(huge.to_dict())
+    assert {row['id'] for row in model.search('', rate_range=(10 ** 9, None, 'USD'))} == \
+        {row['id'] for row in search_submissions('', rate_range=(10 ** 9, None, 'USD'))}
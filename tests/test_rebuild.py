@@ -0,0 +1,133 @@
+import sqlite3
+import pytest
+from app import Attachment, AttachmentBlob, ResumeSubmission
+from rebuild import RESUME_SUBMISSION_MAPPING, model_ddl, rebuild_table
+
+OLD_SCHEMA = '''
+CREATE TABLE resume_submission (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recruiter_firm TEXT NOT NULL,
+    client_name TEXT NOT NULL,
+    recruiter_name TEXT NOT NULL,
+    recruiter_contact TEXT NOT NULL,
+    submission_date DATETIME NOT NULL,
+    job_id TEXT NOT NULL,
+    notes TEXT
+)
+'''
+
+@pytest.fixture
+def old_db(tmp_path):
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute(OLD_SCHEMA)
+        conn.executemany(
+            "INSERT INTO resume_submission (recruiter_firm, client_name, recruiter_name, "
+            "recruiter_contact, submission_date, job_id, notes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(f'Firm {i}', 'Client', 'Recruiter', 'r@example.com', '2025-01-09 00:00:00.000000',
+              f'JOB{i}', None) for i in range(2500)]
+        )
+    conn.close()
+    return path
+
+def test_rebuild_maps_columns_and_swaps(old_db, tmp_path):
+    target = str(tmp_path / 'new.db')
+    stats = rebuild_table(old_db, target, 'resume_submission',
+                          model_ddl(ResumeSubmission.__table__), RESUME_SUBMISSION_MAPPING,
+                          batch_size=1000)
+    assert stats['rows'] == 2500
+    with sqlite3.connect(target) as conn:
+        row = conn.execute("SELECT id, position, interview_date FROM resume_submission "
+                           "WHERE job_id = 'JOB41'").fetchone()
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    conn.close()
+    assert row == (42, 'Not Specified', None)
+    assert '_rebuild_checkpoint' not in tables
+
+def test_interrupted_rebuild_resumes(old_db, tmp_path):
+    target = str(tmp_path / 'new.db')
+    seen = []
+
+    def flaky_firm(record):
+        seen.append(record['id'])
+        if len(seen) == 1500:
+            raise RuntimeError("simulated crash")
+        return record['recruiter_firm']
+
+    mapping = dict(RESUME_SUBMISSION_MAPPING, recruiter_firm=flaky_firm)
+    ddl = model_ddl(ResumeSubmission.__table__)
+    with pytest.raises(RuntimeError):
+        rebuild_table(old_db, target, 'resume_submission', ddl, mapping, batch_size=1000)
+
+    stats = rebuild_table(old_db, target, 'resume_submission', ddl, mapping, batch_size=1000)
+    assert stats['resumed_from'] == 1000
+    assert stats['copied'] == 1500
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("SELECT COUNT(DISTINCT id) FROM resume_submission").fetchone()[0] == 2500
+    conn.close()
+
+def test_rebuild_carries_side_tables(old_db, tmp_path):
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("CREATE TABLE attachment_blob (sha256 TEXT PRIMARY KEY, size INTEGER, ref_count INTEGER)")
+        conn.execute("INSERT INTO attachment_blob VALUES ('abc', 10, 1)")
+    conn.close()
+    target = str(tmp_path / 'new.db')
+    carry = {table.name: model_ddl(table) for table in (AttachmentBlob.__table__, Attachment.__table__)}
+    rebuild_table(old_db, target, 'resume_submission', model_ddl(ResumeSubmission.__table__),
+                  RESUME_SUBMISSION_MAPPING, carry=carry)
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("SELECT * FROM attachment_blob").fetchall() == [('abc', 10, 1)]
+    conn.close()
+
+def test_failed_carry_leaves_nothing_behind(old_db, tmp_path):
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("CREATE TABLE attachment_blob (sha256 TEXT PRIMARY KEY, size INTEGER, ref_count INTEGER)")
+        conn.execute("INSERT INTO attachment_blob VALUES ('abc', 10, 1)")
+        conn.execute("CREATE TABLE attachment (id INTEGER PRIMARY KEY, submission_id INTEGER, sha256 TEXT, "
+                     "filename TEXT, content_type TEXT, size INTEGER, uploaded_at DATETIME)")
+        conn.execute("INSERT INTO attachment (id, submission_id, sha256) VALUES (1, 1, 'abc')")
+    conn.close()
+    target = str(tmp_path / 'new.db')
+    carry = {table.name: model_ddl(table) for table in (AttachmentBlob.__table__, Attachment.__table__)}
+    ddl = model_ddl(ResumeSubmission.__table__)
+    with pytest.raises(sqlite3.IntegrityError):
+        rebuild_table(old_db, target, 'resume_submission', ddl, RESUME_SUBMISSION_MAPPING, carry=carry)
+
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("UPDATE attachment SET filename = 'cv.pdf', content_type = 'application/pdf', size = 10, "
+                     "uploaded_at = '2025-01-09 00:00:00.000000'")
+    conn.close()
+    # The source changed since the failed run, so the copy starts over
+    stats = rebuild_table(old_db, target, 'resume_submission', ddl, RESUME_SUBMISSION_MAPPING, carry=carry)
+    assert stats['resumed_from'] == 0
+    assert stats['rows'] == 2500
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM attachment").fetchone()[0] == 1
+    conn.close()
+
+def test_rebuild_restarts_when_source_changed_since_interruption(old_db, tmp_path):
+    target = str(tmp_path / 'new.db')
+    calls = []
+
+    def flaky_firm(record):
+        calls.append(record['id'])
+        if len(calls) == 1500:
+            raise RuntimeError("simulated crash")
+        return record['recruiter_firm']
+
+    mapping = dict(RESUME_SUBMISSION_MAPPING, recruiter_firm=flaky_firm)
+    ddl = model_ddl(ResumeSubmission.__table__)
+    with pytest.raises(RuntimeError):
+        rebuild_table(old_db, target, 'resume_submission', ddl, mapping, batch_size=1000)
+
+    # A row the interrupted run already copied is edited before the resume
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("UPDATE resume_submission SET recruiter_firm = 'Edited Firm' WHERE id = 1")
+    conn.close()
+
+    stats = rebuild_table(old_db, target, 'resume_submission', ddl, mapping, batch_size=1000)
+    assert stats['resumed_from'] == 0
+    assert stats['rows'] == 2500
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("SELECT recruiter_firm FROM resume_submission WHERE id = 1").fetchone()[0] == 'Edited Firm'
+    conn.close()
@@ -0,0 +1,135 @@
+import time
+import threading
+import pytest
+from app import app, db, upgrade_schema
+from sharding import ShardRouter, UnknownTenant
+
+SUBMISSION = {
+    'recruiter_firm': 'Test Firm',
+    'client_name': 'Test Client',
+    'recruiter_name': 'John Doe',
+    'recruiter_contact': 'john@example.com',
+    'position': 'Engineer',
+    'rate': '$50/hr',
+    'job_id': 'JOB123',
+    'submission_date': '2025-01-09'
+}
+
+TENANTS = ['alice', 'bob', 'a', 'b', 'c', 'd']
+
+@pytest.fixture
+def router(tmp_path):
+    router = ShardRouter(str(tmp_path), db.metadata, upgrade_schema, TENANTS, max_engines=2)
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.extensions['shard_router'] = router
+    yield router
+    del app.extensions['shard_router']
+    app.config['WTF_CSRF_ENABLED'] = True
+    router.dispose()
+
+def test_tenants_are_isolated(router):
+    """Rows written by one tenant are not visible to another"""
+    with app.test_client() as client:
+        response = client.post('/add', data=SUBMISSION, headers={'X-Tracker-User': 'alice'})
+        assert response.status_code == 200
+
+        alice = client.get('/search?query=Test', headers={'X-Tracker-User': 'alice'}).json
+        bob = client.get('/search?query=Test', headers={'X-Tracker-User': 'bob'}).json
+    assert len(alice) == 1
+    assert bob == []
+    assert router.tenants() == ['alice', 'bob']
+
+def test_missing_or_invalid_tenant_is_rejected(router):
+    with app.test_client() as client:
+        assert client.get('/search').status_code == 400
+        assert client.get('/search', headers={'X-Tracker-User': '../etc'}).status_code == 400
+
+def test_unknown_tenant_is_refused_without_creating_a_shard(router, tmp_path):
+    with app.test_client() as client:
+        assert client.get('/search', headers={'X-Tracker-User': 'mallory123'}).status_code == 403
+        assert client.get('/search?user=mallory123').status_code == 403
+    with pytest.raises(UnknownTenant):
+        router.engine_for('mallory123')
+    assert not (tmp_path / 'mallory123.db').exists()
+    assert set(router._tenant_locks) == set(TENANTS)
+
+def test_tenant_names_ignore_case(router):
+    assert router.engine_for('Alice') is router.engine_for('alice')
+    assert router.tenants() == ['alice']
+    with app.test_client() as client:
+        response = client.post('/add', data=SUBMISSION, headers={'X-Tracker-User': 'ALICE'})
+        assert response.status_code == 200
+        assert len(client.get('/search?query=Test', headers={'X-Tracker-User': 'alice'}).json) == 1
+
+def test_slow_shard_does_not_block_other_tenants(tmp_path):
+    opening, release = threading.Event(), threading.Event()
+
+    def migrate(engine):
+        upgrade_schema(engine)
+        if engine.url.database.endswith('slow.db'):
+            opening.set()
+            release.wait(5)
+
+    router = ShardRouter(str(tmp_path), db.metadata, migrate, ['slow', 'fast'])
+    slow = threading.Thread(target=router.engine_for, args=('slow',))
+    slow.start()
+    try:
+        assert opening.wait(5)
+        router.engine_for('fast')
+        assert router.open_engines() == ['fast']
+    finally:
+        release.set()
+        slow.join()
+    assert router.open_engines() == ['fast', 'slow']
+    router.dispose()
+
+def test_engine_lru_is_bounded(router):
+    for tenant in ('a', 'b', 'c'):
+        router.engine_for(tenant)
+    assert router.open_engines() == ['b', 'c']
+    router.engine_for('b')
+    router.engine_for('d')
+    assert router.open_engines() == ['b', 'd']
+    assert router.migrate_all() == sorted(TENANTS)
+
+def test_backups_are_per_tenant(router, tmp_path):
+    backup_dir = app.config['BACKUP_DIR']
+    app.config['BACKUP_DIR'] = str(tmp_path / 'backups')
+    try:
+        with app.test_client() as client:
+            alice = {'X-Tracker-User': 'alice'}
+            assert client.post('/backup', headers=alice).status_code == 202
+            for _ in range(100):
+                listing = client.get('/backups', headers=alice).json
+                if not listing['running']:
+                    break
+                time.sleep(0.05)
+            assert len(listing['snapshots']) == 1
+            assert client.get('/backups', headers={'X-Tracker-User': 'bob'}).json['snapshots'] == []
+        assert (tmp_path / 'backups' / 'alice').is_dir()
+    finally:
+        app.config['BACKUP_DIR'] = backup_dir
+
+def test_mixed_case_shards_are_renamed(tmp_path):
+    legacy = ShardRouter(str(tmp_path), db.metadata, upgrade_schema, ['alice'])
+    legacy._open(str(tmp_path / 'Alice.db')).dispose()
+    legacy._open(str(tmp_path / 'Bob.db')).dispose()
+    legacy._open(str(tmp_path / 'bob.db')).dispose()
+    with app.app_context():
+        engine = legacy._open(str(tmp_path / 'Alice.db'))
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO resume_submission (recruiter_firm, client_name, recruiter_name, recruiter_contact, "
+                "position, job_id, submission_date, row_version) VALUES ('Old Firm', 'c', 'r', 'x', 'p', 'J1', '2025-01-09', 1)"
+            )
+        engine.dispose()
+
+    router = ShardRouter(str(tmp_path), db.metadata, upgrade_schema, ['alice', 'bob'])
+    assert router.migrate_all() == ['alice', 'bob']
+    names = sorted(path.name for path in tmp_path.iterdir())
+    # Bob.db clashes with an existing bob.db and is left for a human to merge
+    assert names == ['Bob.db', 'alice.db', 'bob.db']
+    with router.engine_for('alice').connect() as conn:
+        assert conn.exec_driver_sql("SELECT recruiter_firm FROM resume_submission").scalar() == 'Old Firm'
+    router.dispose()